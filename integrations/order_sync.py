@@ -69,8 +69,9 @@ def sync_orders(shopify_api, order_store, wimood_api=None, product_mapping=None)
     LOGGER.info("Fetching unfulfilled orders from Shopify...")
     shopify_orders = shopify_api.get_unfulfilled_orders()
 
-    existing_ids = {o['shopify_order_id'] for o in order_store.get_all_orders()}
+    existing_ids = order_store.get_order_ids()
 
+    fetched = []
     for order in shopify_orders:
         order_id = order.get('id')
         order_number = str(order.get('order_number', order.get('name', '')))
@@ -80,13 +81,16 @@ def sync_orders(shopify_api, order_store, wimood_api=None, product_mapping=None)
         if order_id not in existing_ids:
             results['new_orders'] += 1
 
-        order_store.upsert_order({
+        fetched.append({
             'shopify_order_id': order_id,
             'order_number': order_number,
             'fulfillment_status': fulfillment_status,
             'created_at': created_at,
         })
 
+    # One transaction for the whole fetch instead of a commit per order
+    order_store.upsert_orders_bulk(fetched)
+
     # --- Step 2: Process all active orders in a single pass ---
     active_orders = order_store.get_active_orders()
 
@@ -161,7 +165,7 @@ def _submit_order(shopify_api, order_store, wimood_api, product_mapping, stored_
 
             mapping = product_mapping.get_by_sku(sku)
             if mapping is None:
-                LOGGER.debug(f"  SKU {sku} not in product mapping (non-Wimood product)")
+                LOGGER.debug("  SKU %s not in product mapping (non-Wimood product)", sku)
                 continue
 
             wimood_items.append({
@@ -74,7 +74,7 @@ class ShopifyAPI:
         """Log Shopify rate limit header if present."""
         rate_limit = response.headers.get('X-Shopify-Shop-Api-Call-Limit')
         if rate_limit:
-            LOGGER.debug(f"Rate limit: {rate_limit}")
+            LOGGER.debug("Rate limit: %s", rate_limit)
 
     def get_all_products(self) -> List[Dict]:
         """
@@ -200,7 +200,7 @@ class ShopifyAPI:
 
         self._rate_limit()
         create_url = f"{self.base_url}/products.json"
-        LOGGER.debug(f"POST {create_url}")
+        LOGGER.debug("POST %s", create_url)
         response = self._request(
             'POST',
             create_url,
@@ -331,8 +331,8 @@ class ShopifyAPI:
 
         self._rate_limit()
         deactivate_url = f"{self.base_url}/products/{shopify_product_id}.json"
-        LOGGER.debug(f"PUT {deactivate_url}")
-        LOGGER.debug(f"Payload: {payload}")
+        LOGGER.debug("PUT %s", deactivate_url)
+        LOGGER.debug("Payload: %s", payload)
         response = self._request(
             'PUT',
             deactivate_url,
@@ -343,7 +343,7 @@ class ShopifyAPI:
             LOGGER.error(f"Failed to deactivate product {shopify_product_id}")
             return False
 
-        LOGGER.debug(f"Response status: {response.status_code}")
+        LOGGER.debug("Response status: %s", response.status_code)
         self._log_rate_limit(response)
         LOGGER.info(f"Deactivated product in Shopify (ID: {shopify_product_id})")
         return True
@@ -367,7 +367,7 @@ class ShopifyAPI:
             return None
 
         self._location_id = locations[0]['id']
-        LOGGER.debug(f"Cached location_id={self._location_id}")
+        LOGGER.debug("Cached location_id=%s", self._location_id)
         return self._location_id
 
     def _build_metafields(self, product_data: Dict) -> List[Dict]:
@@ -483,7 +483,10 @@ class ShopifyAPI:
             LOGGER.warning("No location_id available for inventory update.")
             return
 
-        LOGGER.debug(f"Setting inventory: location_id={location_id}, inventory_item_id={inventory_item_id}, quantity={quantity}")
+        LOGGER.debug(
+            "Setting inventory: location_id=%s, inventory_item_id=%s, quantity=%s",
+            location_id, inventory_item_id, quantity
+        )
 
         payload = {
             "location_id": location_id,
@@ -493,8 +496,8 @@ class ShopifyAPI:
 
         self._rate_limit()
         inv_url = f"{self.base_url}/inventory_levels/set.json"
-        LOGGER.debug(f"POST {inv_url}")
-        LOGGER.debug(f"Payload: {payload}")
+        LOGGER.debug("POST %s", inv_url)
+        LOGGER.debug("Payload: %s", payload)
         response = self._request(
             'POST',
             inv_url,
@@ -504,7 +507,7 @@ class ShopifyAPI:
         if response is None:
             LOGGER.warning(f"Failed to set inventory for item {inventory_item_id}")
         elif response:
-            LOGGER.debug(f"Inventory set response status: {response.status_code}")
+            LOGGER.debug("Inventory set response status: %s", response.status_code)
             self._log_rate_limit(response)
 
         # Set cost (wholesale price) on the inventory item
@@ -522,7 +525,7 @@ class ShopifyAPI:
 
         self._rate_limit()
         url = f"{self.base_url}/inventory_items/{inventory_item_id}.json"
-        LOGGER.debug(f"Setting cost={cost} on inventory item {inventory_item_id}")
+        LOGGER.debug("Setting cost=%s on inventory item %s", cost, inventory_item_id)
         response = self._request('PUT', url, json=payload)
 
         if response is None:
@@ -535,7 +538,7 @@ class ShopifyAPI:
             LOGGER.error(f"Shopify error setting cost for inventory item {inventory_item_id}: {data['errors']}")
             return False
 
-        LOGGER.debug(f"Cost set OK (status {response.status_code})")
+        LOGGER.debug("Cost set OK (status %s)", response.status_code)
         return True
 
     def get_unfulfilled_orders(self) -> List[Dict]:
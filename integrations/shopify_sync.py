@@ -3,6 +3,9 @@ from typing import Dict, List
 
 LOGGER = logging.getLogger('shopify_sync')
 
+# Mappings confirmed during the product loop are written in batches of this size
+MAPPING_FLUSH_SIZE = 1000
+
 
 def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = False,
                   scraper=None, scrape_cache=None, product_mapping=None) -> Dict[str, int]:
@@ -57,11 +60,16 @@ def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = Fa
         if stale_count:
             LOGGER.info(f"Removed {stale_count} stale product mapping(s) (Shopify product deleted).")
 
+        # Serve the per-product lookups below from memory
+        product_mapping.preload()
+
     # 4. Enrich new products via scraping (skip products that already exist in Shopify)
     if scraper:
         enrich_stats = {'scraped': 0, 'cached': 0, 'skipped': 0, 'failed': 0}
         LOGGER.info("Enriching new products via web scraping...")
 
+        fresh_skus = scrape_cache.fresh_skus() if scrape_cache else set()
+        to_scrape = []
         for product in wimood_products:
             sku = product.get('sku', '')
             if not sku:
@@ -75,7 +83,7 @@ def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = Fa
                     continue
 
             # Check cache first
-            if scrape_cache and not scrape_cache.is_stale(sku):
+            if sku in fresh_skus:
                 cached_data = scrape_cache.get(sku)
                 if cached_data:
                     product.update({
@@ -87,8 +95,11 @@ def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = Fa
                     enrich_stats['cached'] += 1
                     continue
 
-            # Scrape the product page
-            scraped = scraper.scrape_product(product)
+            to_scrape.append(product)
+
+        # Scrape the remaining product pages concurrently
+        scraped_results = scraper.scrape_products(to_scrape) if to_scrape else []
+        for product, scraped in zip(to_scrape, scraped_results):
             if scraped:
                 product.update({
                     'body_html': scraped.get('description', ''),
@@ -97,13 +108,13 @@ def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = Fa
                     'specs': scraped.get('specs', {}),
                 })
                 if scrape_cache:
-                    scrape_cache.set(sku, scraped)
+                    scrape_cache.set(product['sku'], scraped)
                 enrich_stats['scraped'] += 1
             else:
                 enrich_stats['failed'] += 1
 
         if scrape_cache:
-            scrape_cache.save()
+            scrape_cache.flush(force=True)
 
         LOGGER.info(
             f"Enrichment complete — Scraped: {enrich_stats['scraped']}, "
@@ -117,6 +128,7 @@ def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = Fa
     # 6. Process each Wimood product
     LOGGER.info("Processing products...")
     total = len(wimood_products)
+    pending_mappings = []
     for idx, product_data in enumerate(wimood_products, 1):
         sku = product_data.get('sku', '')
         title = product_data.get('title', '')
@@ -161,7 +173,7 @@ def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = Fa
                     results['updated'] += 1
                     # Update mapping if not already set
                     if product_mapping and wimood_product_id:
-                        product_mapping.set_mapping(wimood_product_id, existing['id'], sku)
+                        pending_mappings.append((wimood_product_id, existing['id'], sku))
                 else:
                     results['errors'] += 1
             else:
@@ -169,7 +181,7 @@ def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = Fa
                 results['skipped'] += 1
                 # Ensure mapping exists for skipped products too
                 if product_mapping and wimood_product_id:
-                    product_mapping.set_mapping(wimood_product_id, existing['id'], sku)
+                    pending_mappings.append((wimood_product_id, existing['id'], sku))
         else:
             # New product — create it
             LOGGER.info("  -> CREATE")
@@ -179,6 +191,13 @@ def sync_products(wimood_products: List[Dict], shopify_api, test_mode: bool = Fa
             else:
                 results['errors'] += 1
 
+        if len(pending_mappings) >= MAPPING_FLUSH_SIZE:
+            product_mapping.set_mappings_bulk(pending_mappings)
+            pending_mappings.clear()
+
+    if pending_mappings:
+        product_mapping.set_mappings_bulk(pending_mappings)
+
     # 7. Deactivate products no longer in Wimood feed
     for sku, shopify_product in shopify_sku_map.items():
         if sku not in wimood_skus:
@@ -262,7 +281,7 @@ def _needs_update(shopify_product: Dict, wimood_product: Dict) -> bool:
     shopify_title = shopify_product.get('title', '')
     wimood_title = wimood_product.get('title', '')
     if shopify_title != wimood_title:
-        LOGGER.debug(f"[{sku}] Title differs: Shopify='{shopify_title}' vs Wimood='{wimood_title}'")
+        LOGGER.debug("[%s] Title differs: Shopify='%s' vs Wimood='%s'", sku, shopify_title, wimood_title)
         return True
 
     # Check price on first variant (normalize to 2 decimal places)
@@ -271,26 +290,26 @@ def _needs_update(shopify_product: Dict, wimood_product: Dict) -> bool:
         shopify_price = _normalize_price(variants[0].get('price', '0.00'))
         wimood_price = _normalize_price(wimood_product.get('price', '0.00'))
         if shopify_price != wimood_price:
-            LOGGER.debug(f"[{sku}] Price differs: Shopify='{shopify_price}' vs Wimood='{wimood_price}'")
+            LOGGER.debug("[%s] Price differs: Shopify='%s' vs Wimood='%s'", sku, shopify_price, wimood_price)
             return True
 
         # Check cost (wholesale price)
         shopify_cost = _normalize_price(variants[0].get('cost', '0.00'))
         wimood_cost = _normalize_price(wimood_product.get('wholesale_price', '0.00'))
         if wimood_cost != '0.00' and shopify_cost != wimood_cost:
-            LOGGER.debug(f"[{sku}] Cost differs: Shopify='{shopify_cost}' vs Wimood='{wimood_cost}'")
+            LOGGER.debug("[%s] Cost differs: Shopify='%s' vs Wimood='%s'", sku, shopify_cost, wimood_cost)
             return True
 
     # Check if product is not active (should be reactivated)
     if shopify_product.get('status') != 'active':
-        LOGGER.debug(f"[{sku}] Status is '{shopify_product.get('status')}', needs reactivation")
+        LOGGER.debug("[%s] Status is '%s', needs reactivation", sku, shopify_product.get('status'))
         return True
 
     # Check if enriched description is available but Shopify product has none
     wimood_body = wimood_product.get('body_html', '')
     shopify_body = shopify_product.get('body_html', '') or ''
     if wimood_body and not shopify_body.strip():
-        LOGGER.debug(f"[{sku}] Shopify product missing description, enriched data available")
+        LOGGER.debug("[%s] Shopify product missing description, enriched data available", sku)
         return True
 
     # Check stock
@@ -299,15 +318,15 @@ def _needs_update(shopify_product: Dict, wimood_product: Dict) -> bool:
         shopify_stock = int(variants[0].get('inventory_quantity', 0))
         wimood_stock = int(wimood_product.get('stock', 0))
         if shopify_stock != wimood_stock:
-            LOGGER.debug(f"[{sku}] Stock differs: Shopify={shopify_stock} vs Wimood={wimood_stock}")
+            LOGGER.debug("[%s] Stock differs: Shopify=%s vs Wimood=%s", sku, shopify_stock, wimood_stock)
             return True
 
     # Check if enriched images are available but Shopify product has fewer
     wimood_images = wimood_product.get('local_images', wimood_product.get('images', []))
     shopify_images = shopify_product.get('images', [])
     if wimood_images and len(shopify_images) < len(wimood_images):
-        LOGGER.debug(f"[{sku}] Shopify has {len(shopify_images)} images, enriched data has {len(wimood_images)}")
+        LOGGER.debug("[%s] Shopify has %s images, enriched data has %s", sku, len(shopify_images), len(wimood_images))
         return True
 
-    LOGGER.debug(f"[{sku}] No differences detected")
+    LOGGER.debug("[%s] No differences detected", sku)
     return False
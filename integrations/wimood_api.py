@@ -1,12 +1,31 @@
 import logging
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from requests import Response
+from lxml import etree as ET
+
+if TYPE_CHECKING:
+    from requests import Response
 
 # Get a dedicated logger for API calls
 API_LOGGER = logging.getLogger('wimood_api')
 
+# The feed schema is fixed, so the per-field lookups are compiled once.
+# Product dict key, feed tag and default for each field, in dict order.
+_PRODUCT_FIELDS = (
+    ('product_id', 'product_id', ''),
+    ('sku', 'product_code', ''),
+    ('title', 'product_name', ''),
+    ('brand', 'brand', ''),
+    ('ean', 'ean', ''),
+    ('price', 'msrp', '0.00'),
+    ('wholesale_price', 'prijs', '0.00'),
+    ('stock', 'stock', '0'),
+)
+_PRODUCT_KEYS = tuple(key for key, _, _ in _PRODUCT_FIELDS)
+_PRODUCT_LOOKUPS = tuple((ET.XPath(f'string({tag})'), default) for _, tag, default in _PRODUCT_FIELDS)
+_PRODUCTS_XPATH = ET.XPath('//product')
+
 
 class WimoodAPI:
     """
@@ -58,12 +77,12 @@ class WimoodAPI:
             return False
 
         try:
-            root = ET.fromstring(response.content.decode('utf-8'))
-        except ET.ParseError as e:
+            root = ET.fromstring(response.content)
+        except ET.XMLSyntaxError as e:
             API_LOGGER.error(f"Pre-flight FAILED: Response is not valid XML: {e}")
             return False
 
-        products = root.findall('.//product')
+        products = _PRODUCTS_XPATH(root)
         if not products:
             API_LOGGER.error("Pre-flight FAILED: XML contains no <product> elements.")
             return False
@@ -81,7 +100,7 @@ class WimoodAPI:
         API_LOGGER.info(f"Attempting to fetch data from: {self.api_url}")
 
         # 1. Execute the Request
-        response: Optional[Response] = self.request_manager.request('GET', self.full_url)
+        response: Optional['Response'] = self.request_manager.request('GET', self.full_url)
 
         if response is None:
             # RequestManager already logged the retry errors
@@ -96,45 +115,38 @@ class WimoodAPI:
             )
             return None
 
-        # 3. Parse the XML Content
+        # 3. Stream-parse the XML, extracting each <product> as soon as it is complete.
+        # Processed elements are freed straight away, so memory stays flat regardless of feed size.
+        products_data = []
+
         try:
-            # Decode content and parse the XML tree
-            root = ET.fromstring(response.content.decode('utf-8'))
-        except ET.ParseError as e:
+            # libxml2 picks up the encoding from the XML declaration, so parse the raw bytes
+            for _, element in ET.iterparse(BytesIO(response.content), events=('end',), tag='product'):
+                try:
+                    # Missing and empty fields both fall back to the default
+                    product = dict(zip(
+                        _PRODUCT_KEYS,
+                        [xpath(element).strip() or default for xpath, default in _PRODUCT_LOOKUPS]
+                    ))
+                    # Lazy formatting: the dict repr is only built when DEBUG is enabled
+                    API_LOGGER.debug("Parsed product: %s", product)
+                    products_data.append(product)
+                except Exception as e:
+                    # Log an error but continue processing other products
+                    API_LOGGER.warning(
+                        f"Skipping product due to parsing error: {e}. Element XML: {ET.tostring(element)[:100]}")
+
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except ET.XMLSyntaxError as e:
             API_LOGGER.error(f"Failed to parse XML response from API. Content might be corrupted: {e}")
             return None
 
-        # 4. Extract Product Data
-        products_data = []
-
-        # Adjust this XPath based on your actual XML structure.
-        # Common structure: <root><product_list><product>...</product></product_list></root>
-        product_elements = root.findall('.//product')
-
-        if not product_elements:
+        if not products_data:
             API_LOGGER.warning("No <product> elements found in the XML feed. Check XML structure.")
-            return products_data  # Return empty list, not None
-
-        for element in product_elements:
-            try:
-                product = {
-                    'product_id': element.findtext('product_id', default='').strip(),
-                    'sku': element.findtext('product_code', default='').strip(),
-                    'title': element.findtext('product_name', default='').strip(),
-                    'brand': element.findtext('brand', default='').strip(),
-                    'ean': element.findtext('ean', default='').strip(),
-                    'price': element.findtext('msrp', default='0.00').strip(),
-                    'wholesale_price': element.findtext('prijs', default='0.00').strip(),
-                    'stock': element.findtext('stock', default='0').strip(),
-                }
-                API_LOGGER.debug(f"Parsed product: {product}")
-                products_data.append(product)
-            except Exception as e:
-                # Log an error but continue processing other products
-                API_LOGGER.warning(
-                    f"Skipping product due to parsing error: {e}. Element XML: {ET.tostring(element)[:100]}")
-
-        return products_data
+
+        return products_data  # Empty list, not None, when the feed has no products
 
     # --- Order API methods ---
 
@@ -1,12 +1,59 @@
 import logging
 import re
+import threading
 import time
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 
 LOGGER = logging.getLogger('wimood_scraper')
 
+# Product pages are a few hundred KB; anything far larger is not a product page
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# EXSLT regular expressions, used for the case-insensitive class/text matches
+_XPATH_NS = {'re': 'http://exslt.org/regular-expressions'}
+
+_XPATH_SLIDE_SOURCES = '//div[@data-flickity-bg-lazyload]/@data-flickity-bg-lazyload'
+_XPATH_GALLERY = '//div[re:test(@class, "product.*image|gallery|slider", "i")]'
+_XPATH_SHOP_IMAGES = '//img[contains(@src, "/images/shop/")]'
+_XPATH_SECTION_HEADER = '//text()[re:test(., $pattern, "i")]'
+_XPATH_SPEC_NAMES = './/*[re:test(@class, "field-name|spec-name|label", "i")]'
+_XPATH_SPEC_VALUE = 'following-sibling::*[re:test(@class, "field-value|spec-value|value", "i")][1]'
+
+# Slug building: drop punctuation, then collapse runs of whitespace/underscores/dashes
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATOR_RE = re.compile(r'[\s_-]+')
+
+
+class _HostRateLimiter:
+    """
+    Thread-safe politeness limiter: hands out request slots per host,
+    spaced at least `delay` seconds apart, however many workers are scraping.
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """Block until the URL's host may be requested again."""
+        if self.delay <= 0:
+            return
+
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class WimoodScraper:
     """
@@ -18,10 +65,18 @@ class WimoodScraper:
         self.base_url = env.get('WIMOOD_BASE_URL', '').rstrip('/')
         self.delay = env.get('SCRAPE_DELAY_SECONDS', 2)
         self.max_retries = env.get('MAX_SCRAPE_RETRIES', 5)
+        self.max_workers = env.get('SCRAPE_MAX_WORKERS', 4)
         self.request_manager = request_manager
         self.image_downloader = image_downloader
+        self._rate_limiter = _HostRateLimiter(self.delay)
+        # Image downloads share the page fetches' per-host spacing
+        if image_downloader is not None and image_downloader.rate_limiter is None:
+            image_downloader.rate_limiter = self._rate_limiter
 
-        LOGGER.info(f"WimoodScraper initialized (base_url={self.base_url}, delay={self.delay}s)")
+        LOGGER.info(
+            f"WimoodScraper initialized (base_url={self.base_url}, delay={self.delay}s, "
+            f"workers={self.max_workers})"
+        )
 
     def build_product_url(self, product):
         """
@@ -53,11 +108,11 @@ class WimoodScraper:
             return None
 
         sku = product.get('sku', '?')
-        LOGGER.debug(f"Scraping product {sku}: {url}")
+        LOGGER.debug("Scraping product %s: %s", sku, url)
 
-        time.sleep(self.delay)
+        self._rate_limiter.wait(url)
 
-        response = self.request_manager.request('GET', url)
+        response = self.request_manager.request('GET', url, max_bytes=MAX_PAGE_BYTES)
         if response is None:
             LOGGER.warning(f"Failed to fetch product page for {sku}: {url}")
             return None
@@ -66,11 +121,19 @@ class WimoodScraper:
             LOGGER.warning(f"Non-200 status ({response.status_code}) for {sku}: {url}")
             return None
 
-        soup = BeautifulSoup(response.content, 'lxml')
+        try:
+            # The shop serves UTF-8; without an explicit encoding libxml2
+            # falls back to Latin-1 for pages lacking a charset declaration
+            tree = lxml_html.document_fromstring(
+                response.content, parser=lxml_html.HTMLParser(encoding='utf-8')
+            )
+        except (etree.ParserError, ValueError) as e:
+            LOGGER.warning(f"Could not parse product page for {sku}: {e}")
+            return None
 
-        images = self._extract_images(soup)
-        description = self._extract_description(soup)
-        specs = self._extract_specs(soup)
+        images = self._extract_images(tree)
+        description = self._extract_description(tree)
+        specs = self._extract_specs(tree)
 
         # Download images locally if downloader is available
         local_images = []
@@ -91,6 +154,26 @@ class WimoodScraper:
             'specs': specs,
         }
 
+    def scrape_products(self, products):
+        """
+        Scrape several product pages concurrently with a bounded thread pool.
+        Requests to the same host, image downloads included, are still spaced
+        SCRAPE_DELAY_SECONDS apart.
+
+        Args:
+            products: list of product dicts (see scrape_product)
+
+        Returns:
+            List of scrape results (dict or None), in the same order as `products`.
+        """
+        if not products:
+            return []
+
+        workers = max(1, min(self.max_workers, len(products)))
+        LOGGER.info(f"Scraping {len(products)} product pages with {workers} worker(s)...")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scraper') as executor:
+            return list(executor.map(self.scrape_product, products))
+
     def check_connection(self):
         """
         Pre-flight check: verify we can reach the Wimood website.
@@ -109,7 +192,7 @@ class WimoodScraper:
         LOGGER.info("Pre-flight OK: Wimood website is reachable.")
         return True
 
-    def _extract_images(self, soup):
+    def _extract_images(self, tree):
         """
         Extract product image URLs from the product page gallery.
 
@@ -119,9 +202,7 @@ class WimoodScraper:
         images = []
 
         # Primary: Flickity slider divs with data-flickity-bg-lazyload attribute
-        slides = soup.find_all('div', attrs={'data-flickity-bg-lazyload': True})
-        for slide in slides:
-            src = slide.get('data-flickity-bg-lazyload', '')
+        for src in tree.xpath(_XPATH_SLIDE_SOURCES):
             if src:
                 abs_url = urljoin(self.base_url, src)
                 if abs_url not in images:
@@ -129,14 +210,13 @@ class WimoodScraper:
 
         # Fallback: img tags in gallery containers
         if not images:
-            gallery = soup.find('div', class_=re.compile(r'product.*image|gallery|slider', re.I))
-            if gallery:
-                img_tags = gallery.find_all('img', src=True)
+            galleries = tree.xpath(_XPATH_GALLERY, namespaces=_XPATH_NS)
+            if galleries:
+                sources = galleries[0].xpath('.//img/@src')
             else:
-                img_tags = soup.find_all('img', src=re.compile(r'/images/shop/'))
+                sources = tree.xpath(f'{_XPATH_SHOP_IMAGES}/@src')
 
-            for img in img_tags:
-                src = img.get('src', '')
+            for src in sources:
                 if not src:
                     continue
                 abs_url = urljoin(self.base_url, src)
@@ -145,39 +225,23 @@ class WimoodScraper:
 
         return images[:10]  # Shopify max 10 images
 
-    def _extract_description(self, soup):
+    def _extract_description(self, tree):
         """
         Extract the product description from the "Omschrijving" section.
 
         Returns:
             HTML string of the description, or empty string.
         """
-        # Find the "Omschrijving" heading/button/tab
-        desc_header = soup.find(string=re.compile(r'Omschrijving', re.I))
-        if not desc_header:
-            return ''
-
-        # Navigate to the parent container and find the content section
-        parent = desc_header.find_parent()
-        if parent is None:
-            return ''
-
-        # Try the sibling or next collapsible content div
-        content = parent.find_next_sibling()
-        if content is None:
-            # Try parent's sibling
-            grandparent = parent.find_parent()
-            if grandparent:
-                content = grandparent.find_next_sibling()
-
+        content = self._find_section_content(tree, 'Omschrijving')
         if content is None:
             return ''
 
         # Get the inner HTML, strip excessive whitespace
-        description = content.decode_contents().strip()
-        return description
+        parts = [escape(content.text, quote=False)] if content.text else []
+        parts.extend(etree.tostring(child, encoding='unicode', method='html') for child in content)
+        return ''.join(parts).strip()
 
-    def _extract_specs(self, soup):
+    def _extract_specs(self, tree):
         """
         Extract specifications from the "Specificaties" section.
         Parses field-name/field-value pairs into a dict.
@@ -187,48 +251,74 @@ class WimoodScraper:
         """
         specs = {}
 
-        spec_header = soup.find(string=re.compile(r'Specificaties', re.I))
-        if not spec_header:
-            return specs
-
-        parent = spec_header.find_parent()
-        if parent is None:
-            return specs
-
-        # Find the specs table/container
-        content = parent.find_next_sibling()
-        if content is None:
-            grandparent = parent.find_parent()
-            if grandparent:
-                content = grandparent.find_next_sibling()
-
+        content = self._find_section_content(tree, 'Specificaties')
         if content is None:
             return specs
 
         # Try to find field-name/field-value pairs
-        rows = content.find_all(class_=re.compile(r'field-name|spec-name|label', re.I))
+        rows = content.xpath(_XPATH_SPEC_NAMES, namespaces=_XPATH_NS)
         if rows:
             for row in rows:
-                name = row.get_text(strip=True)
-                value_el = row.find_next_sibling(class_=re.compile(r'field-value|spec-value|value', re.I))
-                if value_el:
-                    specs[name] = value_el.get_text(strip=True)
+                value_els = row.xpath(_XPATH_SPEC_VALUE, namespaces=_XPATH_NS)
+                if value_els:
+                    specs[self._text(row)] = self._text(value_els[0])
         else:
             # Fallback: try table rows
-            table = content.find('table')
-            if table:
-                for tr in table.find_all('tr'):
-                    cells = tr.find_all(['td', 'th'])
+            table = content.find('.//table')
+            if table is not None:
+                for tr in table.iter('tr'):
+                    cells = tr.xpath('.//td | .//th')
                     if len(cells) >= 2:
-                        specs[cells[0].get_text(strip=True)] = cells[1].get_text(strip=True)
+                        specs[self._text(cells[0])] = self._text(cells[1])
 
         return specs
 
+    @classmethod
+    def _find_section_content(cls, tree, header):
+        """
+        Locate the content element of a collapsible section by its header text.
+        The content is the element following the header's container, or the
+        element following that container's parent.
+
+        Returns:
+            The content element, or None if the section is missing.
+        """
+        matches = tree.xpath(_XPATH_SECTION_HEADER, namespaces=_XPATH_NS, pattern=header)
+        if not matches:
+            return None
+
+        # Tail text belongs to the preceding sibling; step up to its container
+        parent = matches[0].getparent()
+        if matches[0].is_tail and parent is not None:
+            parent = parent.getparent()
+        if parent is None:
+            return None
+
+        # Try the sibling or next collapsible content div
+        content = cls._next_element(parent)
+        if content is None:
+            # Try parent's sibling
+            grandparent = parent.getparent()
+            if grandparent is not None:
+                content = cls._next_element(grandparent)
+
+        return content
+
+    @staticmethod
+    def _next_element(element):
+        """Return the next sibling element, skipping comments and processing instructions."""
+        sibling = element.getnext()
+        while sibling is not None and not isinstance(sibling.tag, str):
+            sibling = sibling.getnext()
+        return sibling
+
+    @staticmethod
+    def _text(element):
+        """Concatenated text of an element with each text node stripped."""
+        return ''.join(text.strip() for text in element.itertext())
+
     @staticmethod
     def _slugify(text):
         """Convert a title to a URL-safe slug."""
-        text = text.lower().strip()
-        text = re.sub(r'[^\w\s-]', '', text)
-        text = re.sub(r'[\s_]+', '-', text)
-        text = re.sub(r'-+', '-', text)
-        return text.strip('-')
+        text = _SLUG_STRIP_RE.sub('', text.lower().strip())
+        return _SLUG_SEPARATOR_RE.sub('-', text).strip('-')
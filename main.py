@@ -1,3 +1,5 @@
+import atexit
+import signal
 import sys
 import time
 
@@ -159,6 +161,20 @@ def run_order_sync(shopify_api, order_store, wimood_api=None, product_mapping=No
     return order_results, duration
 
 
+def close_stores(*stores):
+    """
+    Flush and close the SQLite stores on shutdown; ProductMapping also refreshes
+    its planner statistics on close.
+    """
+    for store in stores:
+        if store is None:
+            continue
+        try:
+            store.close()
+        except Exception as e:
+            LOGGER.warning(f"Failed to close {type(store).__name__}: {e}")
+
+
 if __name__ == "__main__":
     # Initialize managers once at startup
     try:
@@ -186,6 +202,11 @@ if __name__ == "__main__":
         if not order_api_ok:
             LOGGER.warning("Wimood Order API unreachable. Dropship submission will be disabled.")
 
+    # Close the stores on any exit; docker stop sends SIGTERM, which is turned
+    # into a normal exit so the atexit handlers run
+    atexit.register(close_stores, scrape_cache, product_mapping, order_store)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     # Run pre-flight checks once at startup
     scraping_ok = preflight_checks(wimood_api, shopify_api, scraper=scraper)
     if not scraping_ok and scraper:
@@ -240,6 +261,12 @@ if __name__ == "__main__":
                     next_sync_in=SYNC_INTERVAL,
                 )
 
+            # Keep planner statistics current after a sync's worth of mapping writes
+            try:
+                product_mapping.optimize()
+            except Exception as optimize_e:
+                LOGGER.warning(f"Failed to optimize product mapping database: {optimize_e}")
+
             next_product_sync = time.time() + SYNC_INTERVAL
             LOGGER.info(_format_next_timers(next_product_sync, next_order_sync))
 
@@ -1,12 +1,27 @@
+import copy
 from unittest.mock import MagicMock
 
 import pytest
 
+
+class FakeResponse:
+    """Plain stand-in for requests.Response; cheaper than a MagicMock per test."""
+
+    __slots__ = ('status_code', 'content', 'text', 'headers')
+
+    def __init__(self, status_code=200, content=b'', text='', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.text = text
+        self.headers = headers or {}
+
 # --- Sample product data ---
+#
+# The sample dicts are built once per session as templates; the function-scoped
+# fixtures below hand each test its own deep copy, since tests mutate them freely.
 
-@pytest.fixture
-def sample_wimood_product():
-    """A product dict as returned by WimoodAPI.fetch_core_products()."""
+@pytest.fixture(scope='session')
+def _sample_wimood_product_template():
     return {
         'product_id': '12345',
         'sku': 'WM-TEST-001',
@@ -19,11 +34,10 @@ def sample_wimood_product():
     }
 
 
-@pytest.fixture
-def sample_enriched_product(sample_wimood_product):
-    """A product dict after enrichment with scraped data."""
+@pytest.fixture(scope='session')
+def _sample_enriched_product_template(_sample_wimood_product_template):
     return {
-        **sample_wimood_product,
+        **_sample_wimood_product_template,
         'body_html': '<p>Een comfortabele bureaustoel met verstelbare armleuningen.</p>',
         'images': [
             'https://wimoodshop.nl/images/shop/12345_1.jpg',
@@ -38,9 +52,8 @@ def sample_enriched_product(sample_wimood_product):
     }
 
 
-@pytest.fixture
-def sample_shopify_product():
-    """A Shopify product dict as returned by the Shopify API."""
+@pytest.fixture(scope='session')
+def _sample_shopify_product_template():
     return {
         'id': 99999,
         'title': 'Test Bureaustoel Deluxe',
@@ -61,17 +74,8 @@ def sample_shopify_product():
     }
 
 
-@pytest.fixture
-def mock_request_manager():
-    """A mock RequestManager that returns configurable responses."""
-    manager = MagicMock()
-    manager.request = MagicMock(return_value=None)
-    return manager
-
-
-@pytest.fixture
-def sample_env():
-    """A complete ENV dict for testing."""
+@pytest.fixture(scope='session')
+def _sample_env_template():
     return {
         'WIMOOD_API_KEY': 'test-key',
         'WIMOOD_API_URL': 'https://api.wimoodshop.nl',
@@ -92,6 +96,38 @@ def sample_env():
 
 
 @pytest.fixture
+def sample_wimood_product(_sample_wimood_product_template):
+    """A product dict as returned by WimoodAPI.fetch_core_products()."""
+    return copy.deepcopy(_sample_wimood_product_template)
+
+
+@pytest.fixture
+def sample_enriched_product(_sample_enriched_product_template):
+    """A product dict after enrichment with scraped data."""
+    return copy.deepcopy(_sample_enriched_product_template)
+
+
+@pytest.fixture
+def sample_shopify_product(_sample_shopify_product_template):
+    """A Shopify product dict as returned by the Shopify API."""
+    return copy.deepcopy(_sample_shopify_product_template)
+
+
+@pytest.fixture
+def mock_request_manager():
+    """A mock RequestManager that returns configurable responses."""
+    manager = MagicMock()
+    manager.request = MagicMock(return_value=None)
+    return manager
+
+
+@pytest.fixture
+def sample_env(_sample_env_template):
+    """A complete ENV dict for testing (flat, so a shallow copy is enough)."""
+    return dict(_sample_env_template)
+
+
+@pytest.fixture(scope='session')
 def sample_xml_response():
     """Sample XML content as returned by the Wimood API."""
     return '''<?xml version="1.0" encoding="UTF-8"?>
@@ -119,7 +155,13 @@ def sample_xml_response():
 </products>'''
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
+def sample_xml_bytes(sample_xml_response):
+    """sample_xml_response encoded once, for use as a mocked response.content."""
+    return sample_xml_response.encode('utf-8')
+
+
+@pytest.fixture(scope='session')
 def sample_product_html():
     """Sample HTML for a Wimood product page (matches actual wimoodshop.com structure)."""
     return '''
@@ -157,3 +199,9 @@ def sample_product_html():
     </div>
 </body>
 </html>'''
+
+
+@pytest.fixture(scope='session')
+def sample_product_html_bytes(sample_product_html):
+    """sample_product_html encoded once, for use as a mocked response.content."""
+    return sample_product_html.encode('utf-8')
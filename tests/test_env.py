@@ -54,6 +54,12 @@ class TestGetEnvVar:
 
 class TestLoadEnvVariables:
 
+    @pytest.fixture(autouse=True)
+    def _fresh_env_cache(self):
+        load_env_variables.cache_clear()
+        yield
+        load_env_variables.cache_clear()
+
     @patch.dict(os.environ, {
         'WIMOOD_API_KEY': 'key123',
         'WIMOOD_API_URL': 'https://api.test.nl',
@@ -83,6 +89,8 @@ class TestLoadEnvVariables:
         assert env['PRODUCT_SYNC_INTERVAL_SECONDS'] == 3600
         assert env['TEST_MODE'] is False
         assert env['SCRAPE_DELAY_SECONDS'] == 2
+        assert env['SCRAPE_POOL_MAXSIZE'] == 32
+        assert env['HTTP_POOL_MAXSIZE'] == 16
 
     @patch('utils.env.load_dotenv')
     @patch.dict(os.environ, {
@@ -103,3 +111,19 @@ class TestLoadEnvVariables:
     def test_missing_required_exits(self, mock_dotenv):
         with pytest.raises(SystemExit):
             load_env_variables()
+
+    @patch('utils.env.load_dotenv')
+    @patch.dict(os.environ, {
+        'WIMOOD_API_KEY': 'key123',
+        'WIMOOD_API_URL': 'https://api.test.nl',
+        'WIMOOD_BASE_URL': 'https://test.nl',
+        'WIMOOD_CUSTOMER_ID': 'CUST001',
+        'SHOPIFY_STORE_URL': 'https://store.myshopify.com',
+        'SHOPIFY_ACCESS_TOKEN': 'shpat_test',
+    }, clear=True)
+    def test_cached_and_read_only(self, mock_dotenv):
+        env = load_env_variables()
+        assert load_env_variables() is env
+        mock_dotenv.assert_called_once()
+        with pytest.raises(TypeError):
+            env['LOG_LEVEL'] = 'DEBUG'
@@ -27,7 +27,7 @@ class TestImageDownloader:
     def test_download_images_success(self, mock_request_manager, temp_images_dir):
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.content = b'fake-image-data'
+        mock_response.iter_content.return_value = [b'fake-image-data']
         mock_response.headers = {'Content-Type': 'image/jpeg'}
         mock_request_manager.request.return_value = mock_response
 
@@ -42,6 +42,20 @@ class TestImageDownloader:
         assert all(os.path.exists(path) for path in downloaded)
         assert mock_request_manager.request.call_count == 2
 
+    def test_download_images_waits_on_rate_limiter(self, mock_request_manager, temp_images_dir):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = [b'fake-image-data']
+        mock_response.headers = {'Content-Type': 'image/jpeg'}
+        mock_request_manager.request.return_value = mock_response
+        limiter = MagicMock()
+
+        downloader = ImageDownloader(mock_request_manager, temp_images_dir, rate_limiter=limiter)
+        urls = ['https://example.com/image1.jpg', 'https://example.com/image2.jpg']
+        downloader.download_images('SKU-001', urls)
+
+        assert sorted(call.args[0] for call in limiter.wait.call_args_list) == urls
+
     def test_download_images_skip_existing(self, mock_request_manager, temp_images_dir):
         downloader = ImageDownloader(mock_request_manager, temp_images_dir)
 
@@ -67,10 +81,25 @@ class TestImageDownloader:
 
         assert len(downloaded) == 0
 
+    def test_download_images_interrupted_stream(self, mock_request_manager, temp_images_dir):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.side_effect = ConnectionError('connection reset')
+        mock_response.headers = {'Content-Type': 'image/jpeg'}
+        mock_request_manager.request.return_value = mock_response
+
+        downloader = ImageDownloader(mock_request_manager, temp_images_dir)
+        downloaded = downloader.download_images('SKU-001', ['https://example.com/image1.jpg'])
+
+        assert downloaded == []
+        assert mock_request_manager.request.call_args.kwargs['stream'] is True
+        mock_response.close.assert_called_once()
+        assert os.listdir(os.path.join(temp_images_dir, 'SKU-001')) == []
+
     def test_download_images_max_limit(self, mock_request_manager, temp_images_dir):
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.content = b'fake-image-data'
+        mock_response.iter_content.return_value = [b'fake-image-data']
         mock_response.headers = {'Content-Type': 'image/jpeg'}
         mock_request_manager.request.return_value = mock_response
 
@@ -80,6 +109,45 @@ class TestImageDownloader:
 
         assert len(downloaded) == 3
 
+    def test_download_images_replaces_empty_file(self, mock_request_manager, temp_images_dir):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = [b'fake-image-data']
+        mock_response.headers = {'Content-Type': 'image/jpeg'}
+        mock_request_manager.request.return_value = mock_response
+
+        downloader = ImageDownloader(mock_request_manager, temp_images_dir)
+        sku_dir = os.path.join(temp_images_dir, 'SKU-001')
+        os.makedirs(sku_dir)
+        open(os.path.join(sku_dir, 'image1.jpg'), 'wb').close()
+
+        downloaded = downloader.download_images('SKU-001', ['https://example.com/image1.jpg'])
+
+        assert len(downloaded) == 1
+        assert mock_request_manager.request.call_count == 1
+        assert os.path.getsize(downloaded[0]) == len(b'fake-image-data')
+
+    def test_download_images_keeps_input_order(self, mock_request_manager, temp_images_dir):
+        ok_response = MagicMock()
+        ok_response.status_code = 200
+        ok_response.iter_content.return_value = [b'fake-image-data']
+        ok_response.headers = {'Content-Type': 'image/jpeg'}
+
+        def fake_request(method, url, **kwargs):
+            return None if 'broken' in url else ok_response
+
+        mock_request_manager.request.side_effect = fake_request
+
+        downloader = ImageDownloader(mock_request_manager, temp_images_dir)
+        urls = [f'https://example.com/image{i}.jpg' for i in range(1, 6)]
+        urls[2] = 'https://example.com/broken.jpg'
+        downloaded = downloader.download_images('SKU-001', urls)
+
+        assert [os.path.basename(path) for path in downloaded] == [
+            'image1.jpg', 'image2.jpg', 'image4.jpg', 'image5.jpg'
+        ]
+        assert mock_request_manager.request.call_count == 5
+
     def test_get_local_images(self, mock_request_manager, temp_images_dir):
         downloader = ImageDownloader(mock_request_manager, temp_images_dir)
 
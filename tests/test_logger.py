@@ -0,0 +1,81 @@
+import io
+import logging
+import time
+
+from utils.logger import _ANSI_RE, BytesConsoleHandler, C, ConsoleFormatter, print_banner
+
+
+def _record(name, level, msg, *args):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class TestPrintBanner:
+
+    def test_box_lines_have_equal_width(self, capsys):
+        print_banner({'TEST_MODE': True, 'ENABLE_ORDER_SYNC': True, 'ENABLE_MONITORING': True})
+        box = [_ANSI_RE.sub('', line) for line in capsys.readouterr().out.splitlines() if line]
+        assert len({len(line) for line in box}) == 1
+        assert any('TEST MODE' in line for line in box)
+
+    def test_written_in_one_call(self, mocker):
+        stdout = mocker.patch('utils.logger.sys.stdout')
+        print_banner({})
+        stdout.write.assert_called_once()
+        out = _ANSI_RE.sub('', stdout.write.call_args.args[0])
+        assert out.startswith('\n\u250c') and out.endswith('\u2518\n\n')
+
+
+class TestConsoleFormatter:
+
+    def test_known_logger_label(self):
+        line = ConsoleFormatter().format(_record('wimood_scraper', logging.INFO, 'Scraped %s', 'SKU-1'))
+        assert f"{C.MAGENTA}\u2042 scraper {C.RST}" in line
+        assert line.endswith(f"{C.RST}Scraped SKU-1{C.RST}")
+
+    def test_unknown_logger_label_padded(self):
+        line = ConsoleFormatter().format(_record('custom', logging.WARNING, 'careful'))
+        assert f"{C.DIM}\u25cb custom  {C.RST}" in line
+        assert f"{C.BOLD}{C.BYELLOW}careful" in line
+
+    def test_next_sync_is_bold(self):
+        line = ConsoleFormatter().format(_record('main', logging.INFO, 'Next sync: 5 minutes'))
+        assert f"{C.BOLD}Next sync: 5 minutes" in line
+
+    def test_timestamp_follows_record_time(self):
+        formatter = ConsoleFormatter()
+        first = _record('main', logging.INFO, 'a')
+        first.created = 1_700_000_000.1
+        later = _record('main', logging.INFO, 'b')
+        later.created = 1_700_000_061.9
+
+        assert formatter.formatTime(first) == formatter.formatTime(first)
+        assert formatter.formatTime(later) != formatter.formatTime(first)
+        assert formatter.formatTime(later)[-2:] == '21'
+
+    def test_timestamp_honours_explicit_datefmt(self):
+        formatter = ConsoleFormatter()
+        record = _record('main', logging.INFO, 'a')
+        record.created = 1_700_000_000.1
+
+        assert formatter.formatTime(record, '%Y') == time.strftime('%Y', formatter.converter(record.created))
+        assert len(formatter.formatTime(record)) == len('HH:MM:SS')
+
+
+class TestBytesConsoleHandler:
+
+    def test_writes_encoded_lines_in_order(self):
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding='utf-8')
+        handler = BytesConsoleHandler(stream)
+
+        stream.write('before\n')
+        handler.emit(_record('main', logging.INFO, 'caf\u00e9 %s', 1))
+        lines = raw.getvalue().decode('utf-8').splitlines()
+        assert lines[0] == 'before'
+        assert lines[1].endswith('caf\u00e9 1')
+
+    def test_falls_back_to_text_stream(self):
+        stream = io.StringIO()
+        handler = BytesConsoleHandler(stream)
+        handler.emit(_record('main', logging.INFO, 'hello'))
+        assert stream.getvalue() == 'hello\n'
@@ -0,0 +1,74 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from utils.monitor import MonitorServer
+
+
+def _get(server, path):
+    port = server._server.server_address[1]
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        return e.code, json.loads(body) if e.headers.get('Content-Type') == 'application/json' else None
+
+
+class TestMonitorServer:
+
+    @pytest.fixture
+    def server(self):
+        server = MonitorServer(port=0)
+        server.start()
+        yield server
+        server._server.shutdown()
+        server._server.server_close()
+
+    def test_health_while_starting(self, server):
+        assert _get(server, '/health') == (503, {'healthy': False})
+
+    def test_health_when_ready(self, server):
+        server.set_ready()
+        assert _get(server, '/health') == (200, {'healthy': True})
+
+    def test_status_reports_sync_results(self, server):
+        server.update_status({'created': 2, 'errors': 0}, 1.234, next_sync_in=60)
+        status, body = _get(server, '/status')
+        assert status == 200
+        assert body['status'] == 'ok'
+        assert body['product_sync']['last_sync_results']['created'] == 2
+        assert body['product_sync']['next_sync_in_seconds'] == 60
+        assert 'order_sync' not in body
+
+    def test_unknown_path(self, server):
+        assert _get(server, '/nope')[0] == 404
+
+    def test_status_body_cached_until_state_changes(self, server):
+        first = server._status_body()
+        assert server._status_body() is first
+
+        server.set_product_waiting(30)
+        second = server._status_body()
+        assert second is not first
+        assert json.loads(second)['product_sync']['next_sync_in_seconds'] == 30
+
+    def test_status_body_expires(self, server, mocker):
+        first = server._status_body()
+        mocker.patch('utils.monitor.time.monotonic', return_value=server._cached_at + server.STATUS_CACHE_SECONDS)
+        assert server._status_body() is not first
+
+    def test_last_sync_is_utc_iso_timestamp(self, server):
+        from datetime import datetime
+
+        server.update_order_status({'new_orders': 1}, 0.5)
+        last_sync = json.loads(server._status_body())['order_sync']['last_sync']
+        assert last_sync.endswith('Z')
+        assert datetime.fromisoformat(last_sync.replace('Z', '+00:00')).utcoffset().total_seconds() == 0
+
+    def test_uptime_ignores_wall_clock_jumps(self, server, mocker):
+        mocker.patch('utils.monitor.time.time', return_value=0.0)
+        mocker.patch('utils.monitor.time.monotonic', return_value=server._start_monotonic + 12.34)
+        assert server._build_response()['uptime_seconds'] == 12.3
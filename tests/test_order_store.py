@@ -0,0 +1,124 @@
+import sqlite3
+
+import pytest
+
+from utils.order_store import OrderStore
+
+
+def _order(order_id, status='unfulfilled', created_at='2025-01-01T00:00:00Z'):
+    return {
+        'shopify_order_id': order_id,
+        'order_number': str(order_id),
+        'fulfillment_status': status,
+        'created_at': created_at,
+    }
+
+
+class TestOrderStore:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = OrderStore(str(tmp_path / 'orders.db'))
+        yield store
+        store.close()
+
+    def test_init_creates_empty_table(self, store):
+        assert len(store) == 0
+
+    def test_uses_wal_journal(self, store):
+        assert store._conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    def test_records_schema_version(self, store):
+        from utils.order_store import _SCHEMA_VERSION
+
+        row = store._conn.execute("SELECT version FROM schema_version WHERE name = 'orders'").fetchone()
+        assert row[0] == _SCHEMA_VERSION
+        # The file-wide user_version is left to the other stores sharing the database
+        assert store._conn.execute('PRAGMA user_version').fetchone()[0] == 0
+
+    def test_upsert_and_get(self, store):
+        store.upsert_order(_order(1001))
+        order = store.get_order(1001)
+        assert order['order_number'] == '1001'
+        assert order['fulfillment_status'] == 'unfulfilled'
+        assert order['dropship_submitted'] == 0
+
+    def test_upsert_preserves_terminal_state(self, store):
+        store.upsert_order(_order(1001))
+        store.update_fulfillment(1001, 'delivered')
+        store.upsert_order(_order(1001, status='unfulfilled'))
+        assert store.get_order(1001)['fulfillment_status'] == 'delivered'
+
+    def test_upsert_orders_bulk(self, store):
+        store.upsert_orders_bulk([_order(1001), _order(1002), _order(1003)])
+        assert len(store) == 3
+
+        store.upsert_orders_bulk([_order(1002, status='fulfilled')])
+        assert len(store) == 3
+        assert store.get_order(1002)['fulfillment_status'] == 'fulfilled'
+
+    def test_upsert_orders_bulk_empty(self, store):
+        store.upsert_orders_bulk([])
+        assert len(store) == 0
+
+    def test_submission_and_polling_queues(self, store):
+        store.upsert_orders_bulk([
+            _order(1001, created_at='2025-01-02T00:00:00Z'),
+            _order(1002, created_at='2025-01-01T00:00:00Z'),
+        ])
+        assert [o['shopify_order_id'] for o in store.get_unsubmitted_orders()] == [1002, 1001]
+
+        store.mark_submitted(1001, 555)
+        assert [o['shopify_order_id'] for o in store.get_unsubmitted_orders()] == [1002]
+        submitted = store.get_submitted_unfulfilled()
+        assert [o['wimood_order_id'] for o in submitted] == [555]
+
+    def test_persists_across_instances(self, tmp_path):
+        db_file = str(tmp_path / 'orders.db')
+        first = OrderStore(db_file)
+        first.upsert_order(_order(1001))
+        first.update_wimood_status(1001, 'shipped', 'TRACK1', 'https://track/1')
+        first.close()
+
+        second = OrderStore(db_file)
+        order = second.get_order(1001)
+        second.close()
+        assert order['wimood_status'] == 'shipped'
+        assert order['tracking_number'] == 'TRACK1'
+
+    def test_get_order_ids(self, store):
+        store.upsert_orders_bulk([_order(1001), _order(1002)])
+        assert store.get_order_ids() == {1001, 1002}
+
+    def test_rows_are_plain_dicts_in_column_order(self, store):
+        store.upsert_order(_order(1001))
+        order = store.get_all_orders()[0]
+        assert type(order) is dict
+        assert list(order)[:4] == ['shopify_order_id', 'order_number', 'fulfillment_status', 'created_at']
+
+    def test_queue_queries_use_composite_index(self, store):
+        from utils.order_store import _SQL_GET_SUBMITTED_UNFULFILLED, _SQL_GET_UNSUBMITTED
+
+        for sql in (_SQL_GET_UNSUBMITTED, _SQL_GET_SUBMITTED_UNFULFILLED):
+            plan = ' '.join(row[-1] for row in store._conn.execute(f'EXPLAIN QUERY PLAN {sql}'))
+            assert 'idx_dropship_created_status' in plan
+            assert 'TEMP B-TREE' not in plan
+
+    def test_migrates_legacy_table_without_dropship_columns(self, tmp_path):
+        db_file = str(tmp_path / 'orders.db')
+        with sqlite3.connect(db_file) as conn:
+            conn.execute(
+                'CREATE TABLE orders (shopify_order_id INTEGER PRIMARY KEY, order_number TEXT NOT NULL, '
+                "fulfillment_status TEXT NOT NULL DEFAULT 'unfulfilled', created_at TEXT NOT NULL, "
+                "tracking_number TEXT DEFAULT '', tracking_url TEXT DEFAULT '', "
+                'synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)'
+            )
+            conn.execute("INSERT INTO orders (shopify_order_id, order_number, created_at) VALUES (1, '1', 'x')")
+        conn.close()
+
+        store = OrderStore(db_file)
+        unsubmitted = store.get_unsubmitted_orders()
+        version = store._conn.execute("SELECT version FROM schema_version WHERE name = 'orders'").fetchone()[0]
+        store.close()
+        assert [o['shopify_order_id'] for o in unsubmitted] == [1]
+        assert version == 1
@@ -112,15 +112,15 @@ class TestSyncOrdersFetchStore:
         ]
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = []
 
         results = sync_orders(mock_shopify, mock_store)
 
         assert results['new_orders'] == 1
-        mock_store.upsert_order.assert_called_once()
-        call_args = mock_store.upsert_order.call_args[0][0]
-        assert call_args['shopify_order_id'] == 1001
+        mock_store.upsert_orders_bulk.assert_called_once()
+        stored = mock_store.upsert_orders_bulk.call_args[0][0]
+        assert [order['shopify_order_id'] for order in stored] == [1001]
 
     def test_existing_orders_not_counted_as_new(self, mocker):
         mock_shopify = mocker.MagicMock()
@@ -135,7 +135,7 @@ class TestSyncOrdersFetchStore:
         ]
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = [{'shopify_order_id': 1001}]
+        mock_store.get_order_ids.return_value = {1001}
         mock_store.get_active_orders.return_value = []
 
         results = sync_orders(mock_shopify, mock_store)
@@ -151,7 +151,7 @@ class TestSyncOrdersDropship:
         mock_shopify.get_unfulfilled_orders.return_value = []
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 2001,
@@ -206,7 +206,7 @@ class TestSyncOrdersDropship:
         mock_shopify.get_unfulfilled_orders.return_value = []
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 2002,
@@ -251,7 +251,7 @@ class TestSyncOrdersDropship:
         mock_shopify.get_unfulfilled_orders.return_value = []
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 2003,
@@ -290,7 +290,7 @@ class TestSyncOrdersPolling:
         mock_shopify.mark_fulfillment_in_progress.return_value = True
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 3001,
@@ -321,7 +321,7 @@ class TestSyncOrdersPolling:
         mock_shopify.get_unfulfilled_orders.return_value = []
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 3001,
@@ -352,7 +352,7 @@ class TestSyncOrdersPolling:
         mock_shopify.create_fulfillment.return_value = True
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 3001,
@@ -390,7 +390,7 @@ class TestSyncOrdersPolling:
         mock_shopify.get_unfulfilled_orders.return_value = []
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 3001,
@@ -423,7 +423,7 @@ class TestSyncOrdersPolling:
         mock_shopify.get_unfulfilled_orders.return_value = []
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 3001,
@@ -457,7 +457,7 @@ class TestSyncOrdersPolling:
         mock_shopify.get_unfulfilled_orders.return_value = []
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 3002,
@@ -490,7 +490,7 @@ class TestSyncOrdersPolling:
         mock_shopify.get_unfulfilled_orders.return_value = []
 
         mock_store = mocker.MagicMock()
-        mock_store.get_all_orders.return_value = []
+        mock_store.get_order_ids.return_value = set()
         mock_store.get_active_orders.return_value = [
             {
                 'shopify_order_id': 3003,
@@ -1,4 +1,5 @@
 import os
+import sqlite3
 import tempfile
 
 import pytest
@@ -62,18 +63,38 @@ class TestProductMapping:
         mapping = ProductMapping(temp_db)
         assert mapping.remove('NONEXISTENT') is False
 
-    def test_get_all_shopify_ids(self, temp_db):
+    def test_set_mappings_bulk(self, temp_db):
         mapping = ProductMapping(temp_db)
         mapping.set_mapping('WIM1', 100, 'SKU-1')
-        mapping.set_mapping('WIM2', 200, 'SKU-2')
-        mapping.set_mapping('WIM3', 300, 'SKU-3')
+        mapping.set_mappings_bulk([
+            ('WIM1', 101, 'SKU-1'),
+            ('WIM2', 200, 'SKU-2'),
+        ])
+        assert len(mapping) == 2
+        assert mapping.get_shopify_id('WIM1') == 101
+        assert mapping.get_by_sku('SKU-2')['wimood_product_id'] == 'WIM2'
+
+    def test_set_mappings_bulk_empty(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        mapping.set_mappings_bulk([])
+        assert len(mapping) == 0
+
+    def test_get_all_shopify_ids(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        mapping.set_mappings_bulk([
+            ('WIM1', 100, 'SKU-1'),
+            ('WIM2', 200, 'SKU-2'),
+            ('WIM3', 300, 'SKU-3'),
+        ])
         ids = mapping.get_all_shopify_ids()
         assert set(ids) == {100, 200, 300}
 
     def test_get_all_mappings(self, temp_db):
         mapping = ProductMapping(temp_db)
-        mapping.set_mapping('WIM1', 100, 'SKU-1')
-        mapping.set_mapping('WIM2', 200, 'SKU-2')
+        mapping.set_mappings_bulk([
+            ('WIM1', 100, 'SKU-1'),
+            ('WIM2', 200, 'SKU-2'),
+        ])
         all_mappings = mapping.get_all_mappings()
         assert len(all_mappings) == 2
         skus = {m['sku'] for m in all_mappings}
@@ -91,3 +112,121 @@ class TestProductMapping:
         assert len(mapping) == 1
         mapping.set_mapping('WIM2', 200, 'SKU-2')
         assert len(mapping) == 2
+
+    def test_uses_wal_journal(self, temp_db):
+        ProductMapping(temp_db)
+        conn = sqlite3.connect(temp_db)
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        conn.close()
+
+    def test_close(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        mapping.set_mapping('WIM1', 100, 'SKU-1')
+        mapping.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            mapping.get_shopify_id('WIM1')
+        assert ProductMapping(temp_db).get_shopify_id('WIM1') == 100
+
+    def test_lookups_use_read_only_connections(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        mapping.set_mapping('WIM1', 100, 'SKU-1')
+        with mapping._reader() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM product_mapping")
+
+        # An uncommitted write doesn't block or leak into lookups
+        mapping._conn.execute("UPDATE product_mapping SET shopify_product_id = 200")
+        assert mapping.get_shopify_id('WIM1') == 100
+        mapping._conn.rollback()
+        mapping.close()
+
+    def test_lookups_cached_until_next_write(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        mapping.set_mapping('WIM1', 100, 'SKU-1')
+        assert mapping.get_shopify_id('WIM1') == 100
+        assert mapping.get_by_sku('SKU-1')['shopify_product_id'] == 100
+        assert mapping.get_shopify_id('WIM2') is None
+
+        # Changes made behind the instance's back are not seen while cached...
+        conn = sqlite3.connect(temp_db)
+        with conn:
+            conn.execute("INSERT INTO product_mapping (wimood_product_id, shopify_product_id, sku) "
+                         "VALUES ('WIM2', 200, 'SKU-2')")
+        conn.close()
+        assert mapping.get_shopify_id('WIM2') is None
+
+        # ...but any write through the instance drops the cache
+        mapping.remove('WIM1')
+        assert mapping.get_shopify_id('WIM1') is None
+        assert mapping.get_by_sku('SKU-1') is None
+        assert mapping.get_shopify_id('WIM2') == 200
+        mapping.close()
+
+    def test_preload_serves_lookups_and_tracks_writes(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        mapping.set_mappings_bulk([('WIM1', 100, 'SKU-1'), ('WIM2', 200, 'SKU-2')])
+        mapping.preload()
+        assert mapping.get_shopify_id('WIM1') == 100
+        assert mapping.get_by_sku('SKU-2') == {'wimood_product_id': 'WIM2', 'shopify_product_id': 200}
+        assert mapping.get_shopify_id('WIM3') is None
+        sku_cache = mapping._sku_cache
+
+        mapping.set_mapping('WIM1', 101, 'SKU-1B')
+        mapping.set_mapping('WIM3', 300, 'SKU-3')
+        mapping.remove('WIM2')
+        assert mapping.get_shopify_id('WIM1') == 101
+        assert mapping.get_by_sku('SKU-1') is None
+        assert mapping.get_by_sku('SKU-1B')['shopify_product_id'] == 101
+        assert mapping.get_shopify_id('WIM3') == 300
+        assert mapping.get_shopify_id('WIM2') is None
+        assert mapping.get_by_sku('SKU-2') is None
+        assert mapping._sku_cache is sku_cache  # updated in place, not rebuilt per write
+
+        # The in-memory view matches what a fresh instance reads from disk
+        fresh = ProductMapping(temp_db)
+        for wimood_id in ('WIM1', 'WIM2', 'WIM3'):
+            assert fresh.get_shopify_id(wimood_id) == mapping.get_shopify_id(wimood_id)
+        fresh.close()
+        mapping.close()
+
+    def test_preload_tracks_shared_skus(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        mapping.set_mappings_bulk([('WIM1', 100, 'SKU-1'), ('WIM2', 200, 'SKU-1')])
+        mapping.preload()
+        assert mapping.get_by_sku('SKU-1')['wimood_product_id'] == 'WIM1'
+
+        # The SKU stays resolvable while another product still has it
+        mapping.remove('WIM1')
+        assert mapping.get_by_sku('SKU-1') == {'wimood_product_id': 'WIM2', 'shopify_product_id': 200}
+
+        # A product written twice in one batch only keeps its last SKU
+        mapping.set_mappings_bulk([('WIM3', 300, 'SKU-3A'), ('WIM3', 300, 'SKU-3B')])
+        assert mapping.get_by_sku('SKU-3A') is None
+        assert mapping.get_by_sku('SKU-3B')['wimood_product_id'] == 'WIM3'
+
+        # The in-memory view matches what a fresh instance reads from disk
+        fresh = ProductMapping(temp_db)
+        for sku in ('SKU-1', 'SKU-3A', 'SKU-3B'):
+            assert fresh.get_by_sku(sku) == mapping.get_by_sku(sku)
+        fresh.close()
+        mapping.close()
+
+    def test_sku_lookup_uses_covering_index(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        with mapping._reader() as conn:
+            plan = ' '.join(row[-1] for row in conn.execute(
+                'EXPLAIN QUERY PLAN SELECT wimood_product_id, shopify_product_id FROM product_mapping WHERE sku = ?',
+                ('SKU-1',)
+            ))
+        mapping.close()
+        assert 'COVERING INDEX idx_sku_cover' in plan
+
+    def test_optimize_collects_statistics(self, temp_db):
+        mapping = ProductMapping(temp_db)
+        mapping.set_mappings_bulk([(f'WIM{i}', i, f'SKU-{i}') for i in range(50)])
+        mapping.optimize()
+        with mapping._lock:
+            analyzed = mapping._conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0]
+        mapping.optimize()  # later calls use PRAGMA optimize
+        mapping.close()
+        assert analyzed > 0
@@ -0,0 +1,58 @@
+import socket
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.request_manager import RequestManager
+
+
+class TestRequestManager:
+
+    @pytest.fixture
+    def manager(self):
+        return RequestManager()
+
+    def _streamed_response(self, chunks, headers=None):
+        response = MagicMock()
+        response.headers = headers or {}
+        response.iter_content.return_value = iter(chunks)
+        return response
+
+    def test_max_bytes_reads_body_within_cap(self, manager, mocker):
+        response = self._streamed_response([b'abc', b'def'])
+        session = mocker.patch.object(manager, '_get_session').return_value
+        session.request.return_value = response
+
+        result = manager.request('GET', 'https://shop.test/p/1', max_bytes=10)
+
+        assert result is response
+        assert result._content == b'abcdef'
+        assert session.request.call_args.kwargs['stream'] is True
+        response.close.assert_called_once()
+
+    def test_max_bytes_aborts_oversized_body(self, manager, mocker):
+        response = self._streamed_response([b'abcdef', b'ghijkl'])
+        mocker.patch.object(manager, '_get_session').return_value.request.return_value = response
+
+        assert manager.request('GET', 'https://shop.test/p/1', max_bytes=10) is None
+        response.close.assert_called_once()
+
+    def test_max_bytes_checks_content_length_first(self, manager, mocker):
+        response = self._streamed_response([b'x'], headers={'Content-Length': '11'})
+        mocker.patch.object(manager, '_get_session').return_value.request.return_value = response
+
+        assert manager.request('GET', 'https://shop.test/p/1', max_bytes=10) is None
+        response.iter_content.assert_not_called()
+
+    def test_max_bytes_ignores_malformed_content_length(self, manager, mocker):
+        response = self._streamed_response([b'abc'], headers={'Content-Length': '3, 3'})
+        mocker.patch.object(manager, '_get_session').return_value.request.return_value = response
+
+        result = manager.request('GET', 'https://shop.test/p/1', max_bytes=10)
+        assert result is response
+        assert result._content == b'abc'
+
+    def test_sessions_use_tcp_keepalive(self, manager):
+        adapter = manager._get_session('https://shop.test/').get_adapter('https://shop.test/')
+        socket_options = adapter.poolmanager.connection_pool_kw['socket_options']
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in socket_options
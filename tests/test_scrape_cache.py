@@ -1,4 +1,6 @@
+import json
 import os
+import sqlite3
 import time
 
 import pytest
@@ -9,16 +11,24 @@ from utils.scrape_cache import ScrapeCache
 class TestScrapeCache:
 
     @pytest.fixture
-    def cache_file(self, tmp_path):
-        return str(tmp_path / 'test_cache.json')
+    def db_file(self, tmp_path):
+        return str(tmp_path / 'test_cache.db')
 
-    def test_empty_cache(self, cache_file):
-        cache = ScrapeCache(cache_file)
+    @pytest.fixture
+    def legacy_file(self, tmp_path):
+        return str(tmp_path / 'scrape_cache.json')
+
+    @pytest.fixture
+    def cache(self, db_file, legacy_file):
+        cache = ScrapeCache(db_file, legacy_file)
+        yield cache
+        cache.close()
+
+    def test_empty_cache(self, cache):
         assert len(cache) == 0
         assert cache.get('NONEXISTENT') is None
 
-    def test_set_and_get(self, cache_file):
-        cache = ScrapeCache(cache_file)
+    def test_set_and_get(self, cache):
         data = {'images': ['img1.jpg'], 'description': 'test', 'specs': {'color': 'red'}}
         cache.set('SKU-001', data)
 
@@ -26,52 +36,113 @@ class TestScrapeCache:
         assert result == data
         assert len(cache) == 1
 
-    def test_save_and_load(self, cache_file):
-        cache = ScrapeCache(cache_file)
-        data = {'images': ['img1.jpg'], 'description': 'test', 'specs': {}}
+    def test_persists_across_instances(self, db_file, legacy_file):
+        cache = ScrapeCache(db_file, legacy_file)
+        data = {'images': ['img1.jpg'], 'description': 'café', 'specs': {}}
         cache.set('SKU-001', data)
-        cache.save()
+        cache.close()
 
         # Load in a new instance
-        cache2 = ScrapeCache(cache_file)
+        cache2 = ScrapeCache(db_file, legacy_file)
         assert cache2.get('SKU-001') == data
+        cache2.close()
 
-    def test_is_stale_missing_entry(self, cache_file):
-        cache = ScrapeCache(cache_file)
+    def test_is_stale_missing_entry(self, cache):
         assert cache.is_stale('NONEXISTENT') is True
 
-    def test_is_stale_fresh_entry(self, cache_file):
-        cache = ScrapeCache(cache_file)
+    def test_is_stale_fresh_entry(self, cache):
         cache.set('SKU-001', {'images': []})
         assert cache.is_stale('SKU-001', max_age_days=7) is False
 
-    def test_is_stale_old_entry(self, cache_file):
-        cache = ScrapeCache(cache_file)
-        cache._cache['SKU-001'] = {
-            'data': {'images': []},
-            'timestamp': time.time() - (8 * 86400),  # 8 days old
-        }
+    def test_is_stale_old_entry(self, cache, mocker):
+        mocker.patch('utils.scrape_cache.time.time', return_value=time.time() - (8 * 86400))  # 8 days old
+        cache.set('SKU-001', {'images': []})
+        mocker.stopall()
         assert cache.is_stale('SKU-001', max_age_days=7) is True
 
-    def test_save_creates_directory(self, tmp_path):
-        cache_file = str(tmp_path / 'subdir' / 'cache.json')
-        cache = ScrapeCache(cache_file)
+    def test_creates_directory(self, tmp_path):
+        db_file = str(tmp_path / 'subdir' / 'cache.db')
+        cache = ScrapeCache(db_file, None)
         cache.set('SKU-001', {'images': []})
-        cache.save()
-        assert os.path.exists(cache_file)
-
-    def test_load_invalid_json(self, cache_file):
+        cache.close()
+        assert os.path.exists(db_file)
+
+    def test_imports_legacy_json_once(self, db_file, legacy_file):
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'SKU-001': {'data': {'images': ['a.jpg']}, 'timestamp': time.time()},
+                'SKU-002': {'data': {'images': []}, 'timestamp': time.time() - (8 * 86400)},
+            }, f)
+
+        cache = ScrapeCache(db_file, legacy_file)
+        assert len(cache) == 2
+        assert cache.get('SKU-001') == {'images': ['a.jpg']}
+        assert cache.is_stale('SKU-001') is False
+        assert cache.is_stale('SKU-002') is True
+        cache.close()
+
+        assert not os.path.exists(legacy_file)
+        assert os.path.exists(f"{legacy_file}.imported")
+
+    def test_import_invalid_legacy_json(self, db_file, legacy_file):
         # Write invalid JSON to file
-        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-        with open(cache_file, 'w') as f:
+        with open(legacy_file, 'w') as f:
             f.write('not valid json{{{')
 
-        cache = ScrapeCache(cache_file)
+        cache = ScrapeCache(db_file, legacy_file)
         assert len(cache) == 0
+        cache.close()
 
-    def test_overwrite_existing_entry(self, cache_file):
-        cache = ScrapeCache(cache_file)
+    def test_overwrite_existing_entry(self, cache):
         cache.set('SKU-001', {'images': ['old.jpg']})
         cache.set('SKU-001', {'images': ['new.jpg']})
         assert cache.get('SKU-001') == {'images': ['new.jpg']}
         assert len(cache) == 1
+
+    def test_stores_compact_json(self, cache):
+        cache.set('SKU-001', {'description': 'café', 'images': ['a.jpg', 'b.jpg']})
+        cache.flush(force=True)
+        with cache._lock:
+            stored = cache._conn.execute("SELECT data FROM scrape_cache WHERE sku = 'SKU-001'").fetchone()[0]
+        assert stored == '{"description":"café","images":["a.jpg","b.jpg"]}'
+
+    def test_sets_are_coalesced_until_flush(self, cache, db_file):
+        def stored_count():
+            conn = sqlite3.connect(db_file)
+            count = conn.execute('SELECT COUNT(*) FROM scrape_cache').fetchone()[0]
+            conn.close()
+            return count
+
+        cache.flush(force=True)  # start a fresh flush interval
+        cache.set('SKU-001', {'images': ['a.jpg']})
+        cache.set('SKU-002', {'images': []})
+        assert stored_count() == 0
+        # Pending entries are visible to lookups before they are written
+        assert cache.get('SKU-001') == {'images': ['a.jpg']}
+        assert cache.is_stale('SKU-002') is False
+
+        cache.flush()
+        assert stored_count() == 0  # throttled
+        cache.flush(force=True)
+        assert stored_count() == 2
+
+    def test_close_flushes_pending_entries(self, db_file, legacy_file):
+        cache = ScrapeCache(db_file, legacy_file)
+        cache.set('SKU-001', {'images': []})
+        cache.close()
+
+        cache2 = ScrapeCache(db_file, legacy_file)
+        assert cache2.get('SKU-001') == {'images': []}
+        cache2.close()
+
+    def test_fresh_skus(self, cache, mocker):
+        mocker.patch('utils.scrape_cache.time.time', return_value=time.time() - (8 * 86400))
+        cache.set('SKU-OLD', {'images': []})
+        cache.set('SKU-REFRESHED', {'images': []})
+        mocker.stopall()
+        cache.flush(force=True)
+
+        cache.set('SKU-NEW', {'images': []})
+        cache.set('SKU-REFRESHED', {'images': ['new.jpg']})  # still pending
+        assert cache.fresh_skus(max_age_days=7) == {'SKU-NEW', 'SKU-REFRESHED'}
+        assert cache.fresh_skus(max_age_days=30) == {'SKU-OLD', 'SKU-NEW', 'SKU-REFRESHED'}
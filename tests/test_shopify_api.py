@@ -1,67 +1,175 @@
-import json
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
 from unittest.mock import MagicMock
 
+import pytest
+
 from integrations.shopify_api import ShopifyAPI
 
 
+def _payload(call):
+    """Return the JSON body passed to a mocked request_manager.request call."""
+    return call.kwargs.get('json')
+
+
+def _has_key(metafields, key):
+    """True if any metafield in the list has the given key."""
+    __tracebackhide__ = True
+    return any(m['key'] == key for m in metafields)
+
+
+# --- Happy-path scenarios ---
+#
+# Each scenario lists the (status_code, json body) of the responses the mocked
+# request manager returns in order, the ShopifyAPI method to call with its
+# arguments, and a check run against the result and the recorded request calls.
+# Arguments wrapped in _Fixture are resolved to the fixture of that name.
+
+@dataclass(frozen=True)
+class _Fixture:
+    name: str
+
+
+@dataclass(frozen=True)
+class Scenario:
+    id: str
+    responses: List[Tuple[int, Dict]]
+    method: str
+    args: Tuple = ()
+    kwargs: Dict = field(default_factory=dict)
+    assertions: Callable = lambda result, calls: None
+
+
+def _assert_create_basic_payload(result, calls):
+    assert result is not None
+    assert result['id'] == 123
+
+    # Verify the create call payload
+    product_payload = _payload(calls[0])['product']
+    assert product_payload['title'] == 'Test Bureaustoel Deluxe'
+    assert product_payload['vendor'] == 'TestBrand'
+    assert 'product_type' not in product_payload
+    assert 'tags' not in product_payload
+    assert product_payload['variants'][0]['sku'] == 'WM-TEST-001'
+    assert product_payload['variants'][0]['barcode'] == '8712345678901'
+
+
+def _assert_update_enriched_payload(result, calls):
+    assert result is not None
+
+    # The update call is the first one (no more GET fetch)
+    product_payload = _payload(calls[0])['product']
+    assert product_payload['vendor'] == 'TestBrand'
+    assert 'body_html' in product_payload
+    # Variant price is included inline
+    assert product_payload['variants'][0]['price'] == '199.99'
+    # local_images is empty in fixture, so no images in payload
+    assert 'images' not in product_payload
+
+
+def _assert_returns_true(result, calls):
+    assert result is True
+
+
+CREATE_PRODUCT_SCENARIO = Scenario(
+    id='create_product_basic_payload',
+    # Calls: create product, locations, inventory set, cost set
+    responses=[
+        (201, {'product': {'id': 123, 'variants': [{'id': 456, 'inventory_item_id': 789}]}}),
+        (200, {'locations': [{'id': 111}]}),
+        (200, {}),
+        (200, {}),
+    ],
+    method='create_product',
+    args=(_Fixture('sample_wimood_product'),),
+    assertions=_assert_create_basic_payload,
+)
+
+UPDATE_PRODUCT_SCENARIO = Scenario(
+    id='update_product_with_enriched_data',
+    # PUT update (single call — no separate GET or variant PUT), then GET locations + POST inventory + PUT cost
+    responses=[
+        (200, {'product': {'id': 99999, 'variants': [{'id': 88888, 'inventory_item_id': 77777}]}}),
+        (200, {'locations': [{'id': 111}]}),
+        (200, {}),
+        (200, {}),
+    ],
+    method='update_product',
+    args=(99999, _Fixture('sample_enriched_product')),
+    kwargs={'existing_shopify_product': _Fixture('sample_shopify_product')},
+    assertions=_assert_update_enriched_payload,
+)
+
+CHECK_CONNECTION_SCENARIO = Scenario(
+    id='check_connection_success',
+    responses=[(200, {'shop': {'id': 1, 'name': 'Test Store'}})],
+    method='check_connection',
+    assertions=_assert_returns_true,
+)
+
+SET_COST_SCENARIO = Scenario(
+    id='set_inventory_item_cost_success',
+    responses=[(200, {'inventory_item': {'id': 12345, 'cost': '10.00'}})],
+    method='_set_inventory_item_cost',
+    args=(12345, '10.00'),
+    assertions=_assert_returns_true,
+)
+
+HAPPY_PATH_SCENARIOS = [
+    CREATE_PRODUCT_SCENARIO,
+    UPDATE_PRODUCT_SCENARIO,
+    CHECK_CONNECTION_SCENARIO,
+    SET_COST_SCENARIO,
+]
+
+
+def _mock_response(status_code, body):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = body
+    response.headers = {}
+    return response
+
+
+@pytest.fixture
+def shopify_api(sample_env, mock_request_manager, mocker):
+    """A ShopifyAPI wired to the mock request manager, with the rate-limit sleep patched out."""
+    mocker.patch('integrations.shopify_api.time.sleep')
+    api = ShopifyAPI(sample_env, mock_request_manager)
+    yield api
+    mock_request_manager.reset_mock()
+
+
 class TestShopifyAPI:
 
     def _make_api(self, sample_env, mock_request_manager):
         return ShopifyAPI(sample_env, mock_request_manager)
 
-    def test_init(self, sample_env, mock_request_manager):
-        api = self._make_api(sample_env, mock_request_manager)
-        assert 'test-store.myshopify.com' in api.base_url
-        assert api.vendor_tag == 'Wimood_Sync'
-        assert api._location_id is None
+    def test_init(self, shopify_api):
+        assert 'test-store.myshopify.com' in shopify_api.base_url
+        assert shopify_api.vendor_tag == 'Wimood_Sync'
+        assert shopify_api._location_id is None
 
-    def test_create_product_basic_payload(self, sample_env, mock_request_manager, sample_wimood_product):
-        created_product = {'id': 123, 'variants': [{'id': 456, 'inventory_item_id': 789}]}
-        mock_response = MagicMock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {'product': created_product}
-        mock_response.text = json.dumps({'product': created_product})
-        mock_response.headers = {}
+    @pytest.mark.parametrize('scenario', HAPPY_PATH_SCENARIOS, ids=lambda s: s.id)
+    def test_happy_path(self, scenario, shopify_api, mock_request_manager, request):
+        def resolve(value):
+            return request.getfixturevalue(value.name) if isinstance(value, _Fixture) else value
 
-        # Calls: create product, locations, inventory set, cost set
-        locations_resp = MagicMock()
-        locations_resp.json.return_value = {'locations': [{'id': 111}]}
-        locations_resp.headers = {}
-        locations_resp.status_code = 200
+        mock_request_manager.request.side_effect = [
+            _mock_response(status_code, body) for status_code, body in scenario.responses
+        ]
 
-        inv_resp = MagicMock()
-        inv_resp.status_code = 200
-        inv_resp.headers = {}
+        args = [resolve(arg) for arg in scenario.args]
+        kwargs = {key: resolve(value) for key, value in scenario.kwargs.items()}
+        result = getattr(shopify_api, scenario.method)(*args, **kwargs)
 
-        cost_resp = MagicMock()
-        cost_resp.status_code = 200
-        cost_resp.headers = {}
-
-        mock_request_manager.request.side_effect = [mock_response, locations_resp, inv_resp, cost_resp]
-
-        api = self._make_api(sample_env, mock_request_manager)
-        result = api.create_product(sample_wimood_product)
-
-        assert result is not None
-        assert result['id'] == 123
+        scenario.assertions(result, mock_request_manager.request.call_args_list)
 
-        # Verify the create call payload
-        create_call = mock_request_manager.request.call_args_list[0]
-        payload = create_call.kwargs.get('json') or create_call[1].get('json')
-        product_payload = payload['product']
-        assert product_payload['title'] == 'Test Bureaustoel Deluxe'
-        assert product_payload['vendor'] == 'TestBrand'
-        assert 'product_type' not in product_payload
-        assert 'tags' not in product_payload
-        assert product_payload['variants'][0]['sku'] == 'WM-TEST-001'
-        assert product_payload['variants'][0]['barcode'] == '8712345678901'
-
-    def test_create_product_with_enriched_data(self, sample_env, mock_request_manager, sample_enriched_product):
+    def test_create_product_with_enriched_data(self, shopify_api, mock_request_manager, sample_enriched_product):
         created_product = {'id': 123, 'variants': [{'id': 456, 'inventory_item_id': 789}]}
         mock_response = MagicMock()
         mock_response.status_code = 201
         mock_response.json.return_value = {'product': created_product}
-        mock_response.text = json.dumps({'product': created_product})
         mock_response.headers = {}
 
         locations_resp = MagicMock()
@@ -78,69 +186,24 @@ class TestShopifyAPI:
 
         mock_request_manager.request.side_effect = [mock_response, locations_resp, inv_resp, cost_resp]
 
-        api = self._make_api(sample_env, mock_request_manager)
-        result = api.create_product(sample_enriched_product)
+        result = shopify_api.create_product(sample_enriched_product)
 
         assert result is not None
 
         create_call = mock_request_manager.request.call_args_list[0]
-        payload = create_call.kwargs.get('json') or create_call[1].get('json')
+        payload = _payload(create_call)
         product_payload = payload['product']
         assert 'body_html' in product_payload
         assert 'bureaustoel' in product_payload['body_html']
         # local_images is empty in fixture, so no images in payload
         assert 'images' not in product_payload
 
-    def test_create_product_failure(self, sample_env, mock_request_manager, sample_wimood_product):
+    def test_create_product_failure(self, shopify_api, mock_request_manager, sample_wimood_product):
         mock_request_manager.request.return_value = None
 
-        api = self._make_api(sample_env, mock_request_manager)
-        result = api.create_product(sample_wimood_product)
+        result = shopify_api.create_product(sample_wimood_product)
         assert result is None
 
-    def test_update_product_with_enriched_data(self, sample_env, mock_request_manager,
-                                               sample_enriched_product, sample_shopify_product):
-        # PUT update (single call now — no separate GET or variant PUT)
-        update_resp = MagicMock()
-        update_resp.status_code = 200
-        update_resp.json.return_value = {
-            'product': {'id': 99999, 'variants': [{'id': 88888, 'inventory_item_id': 77777}]}
-        }
-        update_resp.text = '{}'
-        update_resp.headers = {}
-
-        # GET locations + POST inventory + PUT cost
-        locations_resp = MagicMock()
-        locations_resp.json.return_value = {'locations': [{'id': 111}]}
-        locations_resp.headers = {}
-
-        inv_resp = MagicMock()
-        inv_resp.status_code = 200
-        inv_resp.headers = {}
-
-        cost_resp = MagicMock()
-        cost_resp.status_code = 200
-        cost_resp.headers = {}
-
-        mock_request_manager.request.side_effect = [update_resp, locations_resp, inv_resp, cost_resp]
-
-        api = self._make_api(sample_env, mock_request_manager)
-        result = api.update_product(99999, sample_enriched_product,
-                                    existing_shopify_product=sample_shopify_product)
-
-        assert result is not None
-
-        # The update call is the first one (no more GET fetch)
-        update_call = mock_request_manager.request.call_args_list[0]
-        payload = update_call.kwargs.get('json') or update_call[1].get('json')
-        product_payload = payload['product']
-        assert product_payload['vendor'] == 'TestBrand'
-        assert 'body_html' in product_payload
-        # Variant price is included inline
-        assert product_payload['variants'][0]['price'] == '199.99'
-        # local_images is empty in fixture, so no images in payload
-        assert 'images' not in product_payload
-
     def test_location_id_cached(self, sample_env, mock_request_manager):
         api = self._make_api(sample_env, mock_request_manager)
 
@@ -157,7 +220,7 @@ class TestShopifyAPI:
         # Should only call the API once
         assert mock_request_manager.request.call_count == 1
 
-    def test_get_all_products_pagination(self, sample_env, mock_request_manager):
+    def test_get_all_products_pagination(self, shopify_api, mock_request_manager):
         page1_resp = MagicMock()
         page1_resp.status_code = 200
         page1_resp.json.return_value = {'products': [{'id': 1}, {'id': 2}]}
@@ -170,29 +233,18 @@ class TestShopifyAPI:
 
         mock_request_manager.request.side_effect = [page1_resp, page2_resp]
 
-        api = self._make_api(sample_env, mock_request_manager)
-        products = api.get_all_products()
+        products = shopify_api.get_all_products()
 
         assert len(products) == 3
         assert products[0]['id'] == 1
         assert products[2]['id'] == 3
 
-    def test_check_connection_success(self, sample_env, mock_request_manager):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {'shop': {'id': 1, 'name': 'Test Store'}}
-        mock_resp.headers = {}
-        mock_request_manager.request.return_value = mock_resp
-
-        api = self._make_api(sample_env, mock_request_manager)
-        assert api.check_connection() is True
-
-    def test_check_connection_failure(self, sample_env, mock_request_manager):
+    def test_check_connection_failure(self, shopify_api, mock_request_manager):
         mock_request_manager.request.return_value = None
 
-        api = self._make_api(sample_env, mock_request_manager)
-        assert api.check_connection() is False
+        assert shopify_api.check_connection() is False
 
-    def test_set_inventory_item_cost_error_response(self, sample_env, mock_request_manager):
+    def test_set_inventory_item_cost_error_response(self, shopify_api, mock_request_manager):
         """Test that _set_inventory_item_cost detects errors in the response body."""
         error_resp = MagicMock()
         error_resp.status_code = 200
@@ -201,24 +253,10 @@ class TestShopifyAPI:
 
         mock_request_manager.request.return_value = error_resp
 
-        api = self._make_api(sample_env, mock_request_manager)
-        result = api._set_inventory_item_cost(12345, '10.00')
+        result = shopify_api._set_inventory_item_cost(12345, '10.00')
         assert result is False
 
-    def test_set_inventory_item_cost_success(self, sample_env, mock_request_manager):
-        """Test that _set_inventory_item_cost returns True on success."""
-        success_resp = MagicMock()
-        success_resp.status_code = 200
-        success_resp.json.return_value = {'inventory_item': {'id': 12345, 'cost': '10.00'}}
-        success_resp.headers = {}
-
-        mock_request_manager.request.return_value = success_resp
-
-        api = self._make_api(sample_env, mock_request_manager)
-        result = api._set_inventory_item_cost(12345, '10.00')
-        assert result is True
-
-    def test_fetch_inventory_item_costs(self, sample_env, mock_request_manager, sample_shopify_product):
+    def test_fetch_inventory_item_costs(self, shopify_api, mock_request_manager, sample_shopify_product):
         """Test batch-fetching inventory item costs."""
         resp = MagicMock()
         resp.status_code = 200
@@ -230,27 +268,23 @@ class TestShopifyAPI:
         resp.headers = {}
         mock_request_manager.request.return_value = resp
 
-        api = self._make_api(sample_env, mock_request_manager)
-        costs = api.fetch_inventory_item_costs([sample_shopify_product])
+        costs = shopify_api.fetch_inventory_item_costs([sample_shopify_product])
 
         assert costs == {77777: '149.99'}
 
-    def test_fetch_inventory_item_costs_empty(self, sample_env, mock_request_manager):
+    def test_fetch_inventory_item_costs_empty(self, shopify_api, mock_request_manager):
         """Test with no products returns empty dict."""
-        api = self._make_api(sample_env, mock_request_manager)
-        costs = api.fetch_inventory_item_costs([])
+        costs = shopify_api.fetch_inventory_item_costs([])
         assert costs == {}
         mock_request_manager.request.assert_not_called()
 
-    def test_build_metafields(self, sample_env, mock_request_manager, sample_enriched_product):
-        api = self._make_api(sample_env, mock_request_manager)
-        metafields = api._build_metafields(sample_enriched_product)
+    def test_build_metafields(self, shopify_api, sample_enriched_product):
+        metafields = shopify_api._build_metafields(sample_enriched_product)
 
-        keys = [m['key'] for m in metafields]
-        assert 'brand' in keys
-        assert 'ean' in keys
-        assert 'wholesale_price' in keys
-        assert 'specs' in keys
+        assert _has_key(metafields, 'brand')
+        assert _has_key(metafields, 'ean')
+        assert _has_key(metafields, 'wholesale_price')
+        assert _has_key(metafields, 'specs')
 
         specs_field = next(m for m in metafields if m['key'] == 'specs')
         assert specs_field['type'] == 'json'
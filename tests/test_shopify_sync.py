@@ -86,6 +86,18 @@ class TestSyncProducts:
         assert results['created'] == 0
         api.create_product.assert_not_called()
 
+    def test_mappings_stored_in_bulk(self, sample_wimood_product, sample_shopify_product):
+        api = self._make_shopify_api()
+        api.get_all_products.return_value = [sample_shopify_product]
+        product_mapping = MagicMock()
+        product_mapping.get_all_mappings.return_value = []
+        product_mapping.get_shopify_id.return_value = None
+
+        sync_products([sample_wimood_product], api, product_mapping=product_mapping)
+
+        product_mapping.set_mappings_bulk.assert_called_once_with([('12345', 99999, 'WM-TEST-001')])
+        product_mapping.set_mapping.assert_not_called()
+
     def test_update_changed_products(self, sample_wimood_product, sample_shopify_product):
         sample_wimood_product['price'] = '249.99'
         api = self._make_shopify_api()
@@ -118,21 +130,22 @@ class TestSyncProducts:
         api = self._make_shopify_api()
 
         scraper = MagicMock()
-        scraper.scrape_product.return_value = {
+        scraper.scrape_products.return_value = [{
             'images': ['img1.jpg'],
             'description': '<p>Test</p>',
             'specs': {'color': 'black'},
-        }
+        }]
 
         cache = MagicMock()
-        cache.is_stale.return_value = True
+        cache.fresh_skus.return_value = set()
         cache.get.return_value = None
 
         results = sync_products([sample_wimood_product], api, scraper=scraper, scrape_cache=cache)
 
-        scraper.scrape_product.assert_called_once()
+        scraper.scrape_products.assert_called_once_with([sample_wimood_product])
         cache.set.assert_called_once()
-        cache.save.assert_called_once()
+        cache.flush.assert_called_once_with(force=True)
+        assert sample_wimood_product['body_html'] == '<p>Test</p>'
         assert results['created'] == 1
 
     def test_enrichment_from_cache(self, sample_wimood_product):
@@ -140,7 +153,7 @@ class TestSyncProducts:
 
         scraper = MagicMock()
         cache = MagicMock()
-        cache.is_stale.return_value = False
+        cache.fresh_skus.return_value = {sample_wimood_product['sku']}
         cache.get.return_value = {
             'images': ['cached_img.jpg'],
             'description': '<p>Cached</p>',
@@ -150,5 +163,5 @@ class TestSyncProducts:
         results = sync_products([sample_wimood_product], api, scraper=scraper, scrape_cache=cache)
 
         # Should NOT have called scraper since cache is fresh
-        scraper.scrape_product.assert_not_called()
+        scraper.scrape_products.assert_not_called()
         assert results['created'] == 1
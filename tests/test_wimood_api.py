@@ -1,6 +1,5 @@
-from unittest.mock import MagicMock
-
 from integrations.wimood_api import WimoodAPI
+from tests.conftest import FakeResponse
 
 
 class TestWimoodAPI:
@@ -13,12 +12,10 @@ class TestWimoodAPI:
         assert 'api_key=test-key' in api.full_url
         assert 'klantnummer=CUST001' in api.full_url
 
-    def test_fetch_core_products_parses_xml(self, sample_env, mock_request_manager, sample_xml_response):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = sample_xml_response.encode('utf-8')
-        mock_response.text = sample_xml_response
-        mock_request_manager.request.return_value = mock_response
+    def test_fetch_core_products_parses_xml(self, sample_env, mock_request_manager, sample_xml_response,
+                                            sample_xml_bytes):
+        response = FakeResponse(status_code=200, content=sample_xml_bytes, text=sample_xml_response)
+        mock_request_manager.request.return_value = response
 
         api = WimoodAPI(sample_env, mock_request_manager)
         products = api.fetch_core_products()
@@ -47,33 +44,25 @@ class TestWimoodAPI:
         assert result is None
 
     def test_fetch_core_products_invalid_api_key(self, sample_env, mock_request_manager):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = 'Invalid API Key'
-        mock_response.content = b'Invalid API Key'
-        mock_request_manager.request.return_value = mock_response
+        response = FakeResponse(status_code=200, content=b'Invalid API Key', text='Invalid API Key')
+        mock_request_manager.request.return_value = response
 
         api = WimoodAPI(sample_env, mock_request_manager)
         result = api.fetch_core_products()
         assert result is None
 
     def test_fetch_core_products_invalid_xml(self, sample_env, mock_request_manager):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<not valid xml'
-        mock_response.content = b'<not valid xml'
-        mock_request_manager.request.return_value = mock_response
+        response = FakeResponse(status_code=200, content=b'<not valid xml', text='<not valid xml')
+        mock_request_manager.request.return_value = response
 
         api = WimoodAPI(sample_env, mock_request_manager)
         result = api.fetch_core_products()
         assert result is None
 
-    def test_check_connection_success(self, sample_env, mock_request_manager, sample_xml_response):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = sample_xml_response.encode('utf-8')
-        mock_response.text = sample_xml_response
-        mock_request_manager.request.return_value = mock_response
+    def test_check_connection_success(self, sample_env, mock_request_manager, sample_xml_response,
+                                      sample_xml_bytes):
+        response = FakeResponse(status_code=200, content=sample_xml_bytes, text=sample_xml_response)
+        mock_request_manager.request.return_value = response
 
         api = WimoodAPI(sample_env, mock_request_manager)
         assert api.check_connection() is True
@@ -86,12 +75,26 @@ class TestWimoodAPI:
 
     def test_empty_xml_returns_empty_list(self, sample_env, mock_request_manager):
         xml = '<?xml version="1.0"?><products></products>'
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = xml
-        mock_response.content = xml.encode('utf-8')
-        mock_request_manager.request.return_value = mock_response
+        response = FakeResponse(status_code=200, content=xml.encode('utf-8'), text=xml)
+        mock_request_manager.request.return_value = response
 
         api = WimoodAPI(sample_env, mock_request_manager)
         result = api.fetch_core_products()
         assert result == []
+
+    def test_missing_and_empty_fields_use_defaults(self, sample_env, mock_request_manager):
+        xml = (
+            '<?xml version="1.0"?><products><product>'
+            '<product_id>1</product_id><product_code> SKU-1 </product_code><prijs></prijs>'
+            '</product></products>'
+        )
+        response = FakeResponse(status_code=200, content=xml.encode('utf-8'), text=xml)
+        mock_request_manager.request.return_value = response
+
+        api = WimoodAPI(sample_env, mock_request_manager)
+        product = api.fetch_core_products()[0]
+        assert product['sku'] == 'SKU-1'
+        assert product['title'] == ''
+        assert product['price'] == '0.00'
+        assert product['wholesale_price'] == '0.00'
+        assert product['stock'] == '0'
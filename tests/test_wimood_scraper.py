@@ -1,6 +1,8 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
-from integrations.wimood_scraper import WimoodScraper
+from integrations.wimood_scraper import WimoodScraper, _HostRateLimiter
+from tests.conftest import FakeResponse
+from utils.image_downloader import ImageDownloader
 
 
 class TestWimoodScraper:
@@ -29,14 +31,13 @@ class TestWimoodScraper:
         assert WimoodScraper._slugify('Test Bureaustoel Deluxe') == 'test-bureaustoel-deluxe'
         assert WimoodScraper._slugify('  Spaced  Out  ') == 'spaced-out'
         assert WimoodScraper._slugify('Special (chars) & stuff!') == 'special-chars-stuff'
+        assert WimoodScraper._slugify('Tafel _- Wit__Eiken') == 'tafel-wit-eiken'
 
     @patch('integrations.wimood_scraper.time.sleep')
     def test_scrape_product_success(self, mock_sleep, sample_env, mock_request_manager,
-                                     sample_wimood_product, sample_product_html):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = sample_product_html.encode('utf-8')
-        mock_request_manager.request.return_value = mock_response
+                                     sample_wimood_product, sample_product_html_bytes):
+        response = FakeResponse(status_code=200, content=sample_product_html_bytes)
+        mock_request_manager.request.return_value = response
 
         scraper = self._make_scraper(sample_env, mock_request_manager)
         result = scraper.scrape_product(sample_wimood_product)
@@ -48,11 +49,9 @@ class TestWimoodScraper:
 
     @patch('integrations.wimood_scraper.time.sleep')
     def test_extract_images(self, mock_sleep, sample_env, mock_request_manager,
-                            sample_wimood_product, sample_product_html):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = sample_product_html.encode('utf-8')
-        mock_request_manager.request.return_value = mock_response
+                            sample_wimood_product, sample_product_html_bytes):
+        response = FakeResponse(status_code=200, content=sample_product_html_bytes)
+        mock_request_manager.request.return_value = response
 
         scraper = self._make_scraper(sample_env, mock_request_manager)
         result = scraper.scrape_product(sample_wimood_product)
@@ -63,11 +62,9 @@ class TestWimoodScraper:
 
     @patch('integrations.wimood_scraper.time.sleep')
     def test_extract_description(self, mock_sleep, sample_env, mock_request_manager,
-                                  sample_wimood_product, sample_product_html):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = sample_product_html.encode('utf-8')
-        mock_request_manager.request.return_value = mock_response
+                                  sample_wimood_product, sample_product_html_bytes):
+        response = FakeResponse(status_code=200, content=sample_product_html_bytes)
+        mock_request_manager.request.return_value = response
 
         scraper = self._make_scraper(sample_env, mock_request_manager)
         result = scraper.scrape_product(sample_wimood_product)
@@ -76,11 +73,9 @@ class TestWimoodScraper:
 
     @patch('integrations.wimood_scraper.time.sleep')
     def test_extract_specs(self, mock_sleep, sample_env, mock_request_manager,
-                           sample_wimood_product, sample_product_html):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = sample_product_html.encode('utf-8')
-        mock_request_manager.request.return_value = mock_response
+                           sample_wimood_product, sample_product_html_bytes):
+        response = FakeResponse(status_code=200, content=sample_product_html_bytes)
+        mock_request_manager.request.return_value = response
 
         scraper = self._make_scraper(sample_env, mock_request_manager)
         result = scraper.scrape_product(sample_wimood_product)
@@ -99,18 +94,54 @@ class TestWimoodScraper:
 
     @patch('integrations.wimood_scraper.time.sleep')
     def test_scrape_product_non_200(self, mock_sleep, sample_env, mock_request_manager, sample_wimood_product):
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_request_manager.request.return_value = mock_response
+        response = FakeResponse(status_code=404)
+        mock_request_manager.request.return_value = response
 
         scraper = self._make_scraper(sample_env, mock_request_manager)
         result = scraper.scrape_product(sample_wimood_product)
         assert result is None
 
+    def test_scrape_products_preserves_order(self, sample_env, mock_request_manager, sample_product_html_bytes):
+        ok_response = FakeResponse(status_code=200, content=sample_product_html_bytes)
+
+        def fake_request(method, url, **kwargs):
+            return None if '/2/' in url else ok_response
+
+        mock_request_manager.request.side_effect = fake_request
+
+        scraper = self._make_scraper(sample_env, mock_request_manager)
+        products = [{'product_id': str(i), 'title': f'Product {i}', 'sku': f'SKU-{i}'} for i in range(1, 5)]
+        results = scraper.scrape_products(products)
+
+        assert len(results) == 4
+        assert results[1] is None
+        assert all(results[i]['specs'].get('Kleur') == 'Zwart' for i in (0, 2, 3))
+
+    def test_scrape_products_empty(self, sample_env, mock_request_manager):
+        scraper = self._make_scraper(sample_env, mock_request_manager)
+        assert scraper.scrape_products([]) == []
+        mock_request_manager.request.assert_not_called()
+
+    @patch('integrations.wimood_scraper.time.sleep')
+    @patch('integrations.wimood_scraper.time.monotonic', return_value=100.0)
+    def test_rate_limiter_spaces_requests_per_host(self, mock_monotonic, mock_sleep):
+        limiter = _HostRateLimiter(delay=2)
+
+        limiter.wait('https://wimoodshop.nl/nl/products/1/a')
+        limiter.wait('https://wimoodshop.nl/nl/products/2/b')
+        limiter.wait('https://other.example/x')
+
+        # First request per host goes straight through, the second waits one delay
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_shares_rate_limiter_with_image_downloader(self, sample_env, mock_request_manager, tmp_path):
+        downloader = ImageDownloader(mock_request_manager, str(tmp_path))
+        scraper = WimoodScraper(sample_env, mock_request_manager, image_downloader=downloader)
+        assert downloader.rate_limiter is scraper._rate_limiter
+
     def test_check_connection_success(self, sample_env, mock_request_manager):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_request_manager.request.return_value = mock_response
+        response = FakeResponse(status_code=200)
+        mock_request_manager.request.return_value = response
 
         scraper = self._make_scraper(sample_env, mock_request_manager)
         assert scraper.check_connection() is True
@@ -122,7 +153,7 @@ class TestWimoodScraper:
         assert scraper.check_connection() is False
 
     def test_images_limited_to_10(self, sample_env, mock_request_manager):
-        from bs4 import BeautifulSoup
+        from lxml import html as lxml_html
         # Create HTML with 15 Flickity slider images
         slides = ''.join(
             f'<div class="product-slider__slide" data-flickity-bg-lazyload="/images/shop/12345_{i}"></div>'
@@ -131,6 +162,6 @@ class TestWimoodScraper:
         html = f'<html><body><div class="product-slider">{slides}</div></body></html>'
 
         scraper = self._make_scraper(sample_env, mock_request_manager)
-        soup = BeautifulSoup(html, 'lxml')
-        images = scraper._extract_images(soup)
+        tree = lxml_html.document_fromstring(html)
+        images = scraper._extract_images(tree)
         assert len(images) == 10
@@ -1,9 +1,44 @@
-from .env import load_env_variables
-from .formatter import format_seconds_to_human_readable
-from .image_downloader import ImageDownloader
-from .logger import get_main_logger, init_logging_config
-from .monitor import MonitorServer
-from .order_store import OrderStore
-from .product_mapping import ProductMapping
-from .request_manager import init_request_manager
-from .scrape_cache import ScrapeCache
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names are resolved on first access (PEP 562), so importing one helper
+# doesn't pull in requests, sqlite3 or http.server for the others.
+_LAZY = {
+    'load_env_variables': '.env',
+    'format_seconds_to_human_readable': '.formatter',
+    'ImageDownloader': '.image_downloader',
+    'get_main_logger': '.logger',
+    'init_logging_config': '.logger',
+    'MonitorServer': '.monitor',
+    'OrderStore': '.order_store',
+    'ProductMapping': '.product_mapping',
+    'init_request_manager': '.request_manager',
+    'ScrapeCache': '.scrape_cache',
+}
+
+__all__ = list(_LAZY)
+
+if TYPE_CHECKING:
+    from .env import load_env_variables
+    from .formatter import format_seconds_to_human_readable
+    from .image_downloader import ImageDownloader
+    from .logger import get_main_logger, init_logging_config
+    from .monitor import MonitorServer
+    from .order_store import OrderStore
+    from .product_mapping import ProductMapping
+    from .request_manager import init_request_manager
+    from .scrape_cache import ScrapeCache
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
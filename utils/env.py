@@ -1,8 +1,18 @@
 import os
+from functools import lru_cache
+from types import MappingProxyType
 
 from dotenv import load_dotenv
 
 
+def _cast_bool(value) -> bool:
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+# Casters per var_type; any other callable type is applied directly
+_CASTERS = {bool: _cast_bool, int: int, float: float, str: str}
+
+
 def get_env_var(key: str, default=None, var_type=str, required=False):
     """
     Load and cast an environment variable safely.
@@ -24,18 +34,19 @@ def get_env_var(key: str, default=None, var_type=str, required=False):
         return value
 
     try:
-        if var_type == bool:
-            return str(value).lower() in ("1", "true", "yes", "on")
-        return var_type(value)
+        return _CASTERS.get(var_type, var_type)(value)
     except (ValueError, TypeError):
         raise ValueError(f"Environment variable '{key}' must be of type {var_type.__name__}")
 
+@lru_cache(maxsize=1)
 def load_env_variables():
         """
         Loads all required application environment variables.
+        The result is cached for the process; call load_env_variables.cache_clear()
+        to re-read the environment.
 
         Returns:
-            dict: A dictionary of loaded and validated environment settings.
+            MappingProxyType: A read-only mapping of loaded and validated environment settings.
         """
         # Load .env file (if it exists)
         load_dotenv()
@@ -64,6 +75,9 @@ def load_env_variables():
 
                 # --- Scraping ---
                 'SCRAPE_DELAY_SECONDS': get_env_var('SCRAPE_DELAY_SECONDS', default=2, var_type=int, required=False),
+                'SCRAPE_MAX_WORKERS': get_env_var('SCRAPE_MAX_WORKERS', default=4, var_type=int, required=False),
+                'SCRAPE_POOL_MAXSIZE': get_env_var('SCRAPE_POOL_MAXSIZE', default=32, var_type=int, required=False),
+                'HTTP_POOL_MAXSIZE': get_env_var('HTTP_POOL_MAXSIZE', default=16, var_type=int, required=False),
 
                 # --- Monitoring ---
                 'ENABLE_MONITORING': get_env_var('ENABLE_MONITORING', default=False, var_type=bool, required=False),
@@ -86,7 +100,7 @@ def load_env_variables():
                 'ORDER_SYNC_ON_START': get_env_var('ORDER_SYNC_ON_START', default=True, var_type=bool, required=False),
 
             }
-            return env
+            return MappingProxyType(env)
 
         except ValueError as e:
             # Re-raise the error so the main function can handle the fatal exit
@@ -1,3 +1,8 @@
+from functools import lru_cache
+
+
+# The countdown log re-formats the same handful of durations every tick
+@lru_cache(maxsize=256)
 def format_seconds_to_human_readable(seconds: int) -> str:
     """
     Converts a duration in seconds into a friendly string (e.g., '1 hour, 30 minutes').
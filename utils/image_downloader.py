@@ -1,21 +1,28 @@
 import base64
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 LOGGER = logging.getLogger('image_downloader')
 
 IMAGES_DIR = 'data/images'
+MAX_DOWNLOAD_WORKERS = 5
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 
 class ImageDownloader:
     """Downloads and manages product images for Shopify upload."""
 
-    def __init__(self, request_manager, images_dir=IMAGES_DIR):
+    def __init__(self, request_manager, images_dir=IMAGES_DIR, max_workers=MAX_DOWNLOAD_WORKERS,
+                 rate_limiter=None):
         self.request_manager = request_manager
         self.images_dir = images_dir
+        self.max_workers = max_workers
+        # Optional per-host limiter (the scraper's), waited on before every GET
+        self.rate_limiter = rate_limiter
         os.makedirs(images_dir, exist_ok=True)
         LOGGER.info(f"ImageDownloader initialized (dir={images_dir})")
 
@@ -32,17 +39,37 @@ class ImageDownloader:
         sku_dir = os.path.join(self.images_dir, sku)
         os.makedirs(sku_dir, exist_ok=True)
 
-        downloaded = []
+        # One directory read instead of an exists + getsize pair per image
+        existing = self._list_files(sku_dir)
+
+        # File names come from URL basenames, so a plain prefix join is safe
+        base = sku_dir + os.sep
+        targets = []
         for idx, url in enumerate(image_urls[:max_images], 1):
             filename = self._get_filename_from_url(url, idx)
-            filepath = os.path.join(sku_dir, filename)
+            filepath = base + filename
+            targets.append((idx, url, filepath, existing.get(filename, 0) > 0))
+
+        # Fetch the missing images concurrently, once per target file (two URLs
+        # can share a file name, which must not be written by two threads)
+        missing = {}
+        for _, url, filepath, present in targets:
+            if not present:
+                missing.setdefault(filepath, url)
+
+        results = {}
+        if missing:
+            workers = max(1, min(self.max_workers, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='images') as executor:
+                ok = executor.map(self._download_image, missing.values(), missing.keys())
+                results = dict(zip(missing.keys(), ok))
 
-            if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
-                LOGGER.debug(f"Image already exists: {filepath}")
+        downloaded = []
+        for idx, url, filepath, present in targets:
+            if present:
+                LOGGER.debug("Image already exists: %s", filepath)
                 downloaded.append(filepath)
-                continue
-
-            if self._download_image(url, filepath):
+            elif results[filepath]:
                 downloaded.append(filepath)
             else:
                 LOGGER.warning(f"Failed to download image {idx} for SKU {sku}: {url}")
@@ -51,23 +78,45 @@ class ImageDownloader:
         return downloaded
 
     def _download_image(self, url: str, filepath: str) -> bool:
+        part_path = f"{filepath}.part"
         try:
-            response = self.request_manager.request('GET', url, timeout=30)
-            if response is None or response.status_code != 200:
-                return False
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(url)
 
-            content_type = response.headers.get('Content-Type', '')
-            if content_type and not content_type.startswith('image/'):
-                LOGGER.warning(f"Not an image: {url} (Content-Type: {content_type})")
+            # Stream the body so only one chunk per worker is held in memory
+            response = self.request_manager.request('GET', url, timeout=30, stream=True)
+            if response is None:
                 return False
 
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            try:
+                if response.status_code != 200:
+                    return False
+
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and not content_type.startswith('image/'):
+                    LOGGER.warning(f"Not an image: {url} (Content-Type: {content_type})")
+                    return False
 
-            LOGGER.debug(f"Downloaded: {filepath} ({len(response.content)} bytes)")
+                size = 0
+                with open(part_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        size += len(chunk)
+            finally:
+                response.close()
+
+            # Only a complete download takes the final name, so an interrupted
+            # transfer is never mistaken for a cached image
+            os.replace(part_path, filepath)
+
+            LOGGER.debug("Downloaded: %s (%s bytes)", filepath, size)
             return True
         except Exception as e:
             LOGGER.error(f"Exception downloading {url}: {e}")
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
             return False
 
     def _get_filename_from_url(self, url: str, index: int) -> str:
@@ -80,13 +129,20 @@ class ImageDownloader:
     def get_local_images(self, sku: str) -> List[str]:
         """Get list of locally cached images for a SKU."""
         sku_dir = os.path.join(self.images_dir, sku)
-        if not os.path.exists(sku_dir):
+        try:
+            with os.scandir(sku_dir) as entries:
+                return sorted(entry.path for entry in entries if entry.is_file())
+        except FileNotFoundError:
             return []
-        return sorted(
-            os.path.join(sku_dir, f)
-            for f in os.listdir(sku_dir)
-            if os.path.isfile(os.path.join(sku_dir, f))
-        )
+
+    @staticmethod
+    def _list_files(directory: str) -> Dict[str, int]:
+        """Map file name -> size for the regular files in a directory."""
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            return {}
 
     @staticmethod
     def encode_image_base64(filepath: str) -> Optional[str]:
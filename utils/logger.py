@@ -1,6 +1,17 @@
+"""Console logging for the sync service.
+
+Log with lazy %-style arguments (``logger.debug("Scraped %s", sku)``) rather
+than f-strings: records below the active level are dropped before the message
+is ever built, and the formatters render each emitted message only once.
+"""
+import atexit
+import copy
 import logging
+import queue
 import re
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 
 # ANSI color/style codes
@@ -46,6 +57,23 @@ LOGGER_STYLES = {
     'utils.monitor':    (C.DIM,                '\u25cb', 'monitor'),    # ○
 }
 
+# Strips ANSI SGR sequences to measure the visible width of a line
+_ANSI_RE = re.compile(r'\033\[[0-9;]*m')
+
+# Banner palette: (dim, rst, bold, cyan, green, yellow)
+_BANNER_COLORS = (C.DIM, C.RST, C.BOLD, C.BCYAN, C.BGREEN, C.BYELLOW)
+
+# Space runs used to right-pad banner lines, keyed by width
+_PAD_CACHE: dict[int, str] = {}
+
+
+def _pad(n: int) -> str:
+    """Return a string of ``n`` spaces, reusing earlier ones."""
+    pad = _PAD_CACHE.get(n)
+    if pad is None:
+        pad = _PAD_CACHE[n] = ' ' * n
+    return pad
+
 LEVEL_STYLES = {
     'DEBUG':    (C.DIM,                    '\u00b7'),     # ·
     'INFO':     (C.RST,                    '\u2502'),     # │
@@ -55,35 +83,117 @@ LEVEL_STYLES = {
 }
 
 
+# Colored "icon label" and level-icon prefixes, built once per known logger/level
+_LABEL_PREFIX = {
+    name: f"{color}{icon} {label:<8}{C.RST}"
+    for name, (color, icon, label) in LOGGER_STYLES.items()
+}
+_LEVEL_PREFIX = {
+    level: f"{color}{icon}{C.RST}"
+    for level, (color, icon) in LEVEL_STYLES.items()
+}
+
+
+# Whole-message color for levels that always get one; other levels fall back
+# to bold for the "Next sync" status line, or no color
+_MSG_COLOR_BY_LEVEL = {level: LEVEL_STYLES[level][0] for level in ('WARNING', 'ERROR', 'CRITICAL')}
+
+# Codes used on every formatted line, bound as module globals to skip the C.* attribute lookups
+_DIM, _BOLD, _RST = C.DIM, C.BOLD, C.RST
+
+
 class ConsoleFormatter(logging.Formatter):
     """Colored, icon-rich console formatter."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Prefixes for logger names/levels missing from the style tables
+        self._label_cache = {}
+        self._level_cache = {}
+        # Last rendered second and its timestamp; records arrive in bursts
+        self._ts_second = None
+        self._ts = ''
+
+    def _label_prefix(self, name):
+        prefix = _LABEL_PREFIX.get(name) or self._label_cache.get(name)
+        if prefix is None:
+            prefix = self._label_cache[name] = f"{C.DIM}\u25cb {name:<8}{C.RST}"
+        return prefix
+
+    def _level_prefix(self, level):
+        prefix = _LEVEL_PREFIX.get(level) or self._level_cache.get(level)
+        if prefix is None:
+            prefix = self._level_cache[level] = f"{C.RST} {C.RST}"
+        return prefix
+
+    def formatTime(self, record, datefmt=None):
+        """HH:MM:SS, rendered once per wall-clock second; an explicit datefmt is not cached."""
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        if second != self._ts_second:
+            self._ts = time.strftime('%H:%M:%S', self.converter(second))
+            self._ts_second = second
+        return self._ts
+
     def format(self, record):
-        ts = self.formatTime(record, '%H:%M:%S')
+        ts = self.formatTime(record)
 
         level = record.levelname
-        level_color, level_icon = LEVEL_STYLES.get(level, (C.RST, ' '))
+        msg = record.message = record.getMessage()
 
-        style = LOGGER_STYLES.get(record.name, (C.DIM, '\u25cb', record.name))
-        label_color, label_icon, label = style
+        # Color the entire message for warnings/errors, bold for "Next sync" status
+        msg_color = _MSG_COLOR_BY_LEVEL.get(level)
+        if msg_color is None:
+            msg_color = _BOLD if msg.startswith('Next sync:') else _RST
 
-        msg = record.getMessage()
+        level_prefix = self._level_prefix(level)
+        label_prefix = self._label_prefix(record.name)
+        return f"{_DIM}{ts}{_RST} {level_prefix} {label_prefix} {msg_color}{msg}{_RST}"
 
-        # Color the entire message for warnings/errors, bold for "Next sync" status
-        if level in ('WARNING', 'ERROR', 'CRITICAL'):
-            msg_color = level_color
-        elif msg.startswith('Next sync:'):
-            msg_color = C.BOLD
-        else:
-            msg_color = C.RST
 
-        return (
-            f"{C.DIM}{ts}{C.RST} "
-            f"{level_color}{level_icon}{C.RST} "
-            f"{label_color}{label_icon} {label:<8}{C.RST} "
-            f"{msg_color}{msg}{C.RST}"
-        )
+class BytesConsoleHandler(logging.StreamHandler):
+    """Stream handler that encodes each line once and writes it to the stream's byte buffer.
+
+    Skips the text layer's per-write encode/newline translation and the second
+    flush it triggers. Falls back to text writes for streams without a buffer.
+    """
+
+    terminator = '\n'
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._buffer = getattr(self.stream, 'buffer', None)
+        self._encoding = getattr(self.stream, 'encoding', None) or 'utf-8'
 
+    def emit(self, record):
+        if self._buffer is None:
+            super().emit(record)
+            return
+        try:
+            data = (self.format(record) + self.terminator).encode(self._encoding, 'replace')
+            # Push out anything print()ed through the text layer first, so lines stay in order
+            self.stream.flush()
+            self._buffer.write(data)
+            self._buffer.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _QueueHandler(QueueHandler):
+    """Resolves the message in the logging thread; the listener only formats and writes."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Background listener that owns the real output handler (started once)
+_LISTENER = None
 
 
 def print_banner(env_config: dict):
@@ -99,12 +209,7 @@ def print_banner(env_config: dict):
     monitor_port = env_config.get('MONITOR_PORT', 8080)
     store_url = env_config.get('SHOPIFY_STORE_URL', '?')
     log_level = env_config.get('LOG_LEVEL', 'INFO')
-    dim = C.DIM
-    rst = C.RST
-    bold = C.BOLD
-    cyan = C.BCYAN
-    green = C.BGREEN
-    yellow = C.BYELLOW
+    dim, rst, bold, cyan, green, yellow = _BANNER_COLORS
 
     def yn(val):
         if val:
@@ -122,35 +227,49 @@ def print_banner(env_config: dict):
             return f"{m}m{s}s" if s else f"{m}m"
         return f"{secs}s"
 
-    lines = [
-        f"{bold}{cyan}  Wimood → Shopify Sync Service{rst}",
-        "",
-        f"  {dim}Store{rst}      {bold}{store_url}{rst}",
-        f"  {dim}Products{rst}   every {bold}{fmt_interval(sync_interval)}{rst}{'  ' + dim + '(start: immediate)' + rst if product_on_start else '  ' + yellow + '(start: deferred)' + rst}",
-        f"  {dim}Orders{rst}     {yn(order_sync)}{f'  every {bold}{fmt_interval(order_interval)}{rst}' if order_sync else ''}{('  ' + dim + '(start: immediate)' + rst if order_on_start else '  ' + yellow + '(start: deferred)' + rst) if order_sync else ''}",
-        f"  {dim}Monitor{rst}    {yn(monitoring)}{f'  port {bold}{monitor_port}{rst}' if monitoring else ''}",
-        f"  {dim}Log level{rst}  {bold}{log_level}{rst}",
+    def start_hint(on_start):
+        if on_start:
+            return f"  {dim}(start: immediate){rst}"
+        return f"  {yellow}(start: deferred){rst}"
+
+    orders = yn(order_sync)
+    if order_sync:
+        orders += f"  every {bold}{fmt_interval(order_interval)}{rst}{start_hint(order_on_start)}"
+    monitor = yn(monitoring)
+    if monitoring:
+        monitor += f"  port {bold}{monitor_port}{rst}"
+
+    # (label, pre-styled value) rows, rendered through one template
+    rows = [
+        ('Store', f"{bold}{store_url}{rst}"),
+        ('Products', f"every {bold}{fmt_interval(sync_interval)}{rst}{start_hint(product_on_start)}"),
+        ('Orders', orders),
+        ('Monitor', monitor),
+        ('Log level', f"{bold}{log_level}{rst}"),
     ]
+    lines = [f"{bold}{cyan}  Wimood → Shopify Sync Service{rst}", ""]
+    lines.extend(f"  {dim}{label:<11}{rst}{value}" for label, value in rows)
 
     if test_mode:
         lines.append(f"  {yellow}{bold}TEST MODE{rst}  {yellow}limit: {test_limit} products{rst}")
 
-    # Calculate box width (strip ANSI for width calculation)
-    ansi_re = re.compile(r'\033\[[0-9;]*m')
-    max_w = max(len(ansi_re.sub('', line)) for line in lines)
-    box_w = max_w + 2  # padding
+    # Calculate box width (strip ANSI for width calculation), once per line
+    strip = _ANSI_RE.sub
+    visible = [len(strip('', line)) for line in lines]
+    box_w = max(visible) + 2  # padding
 
     border_color = cyan
     top = f"{border_color}\u250c{'─' * box_w}\u2510{rst}"
     bot = f"{border_color}\u2514{'─' * box_w}\u2518{rst}"
     sep = f"{border_color}\u2502{rst}"
 
-    print(f"\n{top}")
-    for line in lines:
-        visible_len = len(ansi_re.sub('', line))
-        pad = box_w - visible_len
-        print(f"{sep}{line}{' ' * pad}{sep}")
-    print(f"{bot}\n")
+    # Write the whole box at once so log lines from other threads can't interleave
+    parts = [top]
+    for line, visible_len in zip(lines, visible):
+        parts.append(f"{sep}{line}{_pad(box_w - visible_len)}{sep}")
+    parts.append(bot)
+    sys.stdout.write('\n' + '\n'.join(parts) + '\n\n')
+    sys.stdout.flush()
 
 
 def init_logging_config(env_config: dict):
@@ -165,9 +284,17 @@ def init_logging_config(env_config: dict):
 
     # Avoid duplicate handlers on re-init
     if not root_logger.hasHandlers():
-        handler = logging.StreamHandler(sys.stdout)
+        # Threads only enqueue records; a single listener thread formats and
+        # writes them, so scraper workers never contend on the stream lock
+        global _LISTENER
+        handler = BytesConsoleHandler(sys.stdout)
         handler.setFormatter(ConsoleFormatter())
-        root_logger.addHandler(handler)
+
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(_QueueHandler(log_queue))
+        _LISTENER = QueueListener(log_queue, handler, respect_handler_level=True)
+        _LISTENER.start()
+        atexit.register(_LISTENER.stop)
 
     # Print the startup banner
     print_banner(env_config)
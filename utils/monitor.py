@@ -1,7 +1,7 @@
 import json
 import threading
 import time
-from datetime import datetime, timezone
+from functools import partial
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from .logger import get_logger
@@ -9,13 +9,59 @@ from .logger import get_logger
 logger = get_logger(__name__)
 
 
+# The only two /health bodies
+_HEALTH_OK = json.dumps({"healthy": True}).encode()
+_HEALTH_BAD = json.dumps({"healthy": False}).encode()
+
+
+def _iso_utc_now():
+    """Current UTC time as an ISO 8601 string with second precision, e.g. ``2025-01-01T12:00:00Z``."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """Serves ``/status`` and ``/health`` for the :class:`MonitorServer` it is bound to."""
+
+    timeout = 5
+
+    def __init__(self, monitor, *args, **kwargs):
+        # Set before super().__init__, which handles the request immediately.
+        self.monitor = monitor
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        try:
+            if self.path in ("/", "/status"):
+                body = self.monitor._status_body()
+                self.send_response(200)
+            elif self.path == "/health":
+                with self.monitor._lock:
+                    healthy = self.monitor._state["status"] != "starting"
+                body = _HEALTH_OK if healthy else _HEALTH_BAD
+                self.send_response(200 if healthy else 503)
+            else:
+                self.send_error(404)
+                return
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except BrokenPipeError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
 class MonitorServer:
     """Lightweight HTTP server that exposes sync status as JSON."""
 
+    STATUS_CACHE_SECONDS = 1.0
+
     def __init__(self, port=8080):
         self._lock = threading.Lock()
         self._port = port
-        self._start_time = time.time()
+        self._start_monotonic = time.monotonic()
         self._state = {
             "status": "starting",
             "product_sync": {
@@ -33,49 +79,46 @@ class MonitorServer:
             },
         }
         self._server = None
+        # Serialized /status body, reused until the state changes or it is
+        # older than STATUS_CACHE_SECONDS (which bounds how stale uptime gets).
+        self._cached_body = None
+        self._cached_at = 0.0
 
     def _build_response(self):
+        # Only the shallow copies need the lock; writers replace the nested
+        # results dicts instead of mutating them, so the copies stay consistent.
         with self._lock:
-            snapshot = {
-                "status": self._state["status"],
-                "uptime_seconds": round(time.time() - self._start_time, 1),
-                "product_sync": dict(self._state["product_sync"]),
-            }
-            if "order_sync" in self._state:
-                snapshot["order_sync"] = dict(self._state["order_sync"])
+            status = self._state["status"]
+            product_sync = self._state["product_sync"].copy()
+            order_sync = self._state.get("order_sync")
+            if order_sync is not None:
+                order_sync = order_sync.copy()
+
+        snapshot = {
+            "status": status,
+            "uptime_seconds": round(time.monotonic() - self._start_monotonic, 1),
+            "product_sync": product_sync,
+        }
+        if order_sync is not None:
+            snapshot["order_sync"] = order_sync
         return snapshot
 
-    def start(self):
-        parent = self
-
-        class Handler(BaseHTTPRequestHandler):
-            timeout = 5
-
-            def do_GET(self):
-                try:
-                    if self.path in ("/", "/status"):
-                        body = json.dumps(parent._build_response(), indent=2).encode()
-                        self.send_response(200)
-                    elif self.path == "/health":
-                        with parent._lock:
-                            healthy = parent._state["status"] != "starting"
-                        body = json.dumps({"healthy": healthy}).encode()
-                        self.send_response(200 if healthy else 503)
-                    else:
-                        self.send_error(404)
-                        return
-                    self.send_header("Content-Type", "application/json")
-                    self.send_header("Content-Length", str(len(body)))
-                    self.end_headers()
-                    self.wfile.write(body)
-                except BrokenPipeError:
-                    pass
-
-            def log_message(self, format, *args):
-                pass
+    def _status_body(self):
+        now = time.monotonic()
+        body = self._cached_body
+        if body is not None and now - self._cached_at < self.STATUS_CACHE_SECONDS:
+            return body
+        body = json.dumps(self._build_response(), indent=2).encode()
+        # A write racing the serialization above can be overwritten here, but
+        # ``now`` predates the snapshot so the body still expires on schedule.
+        with self._lock:
+            self._cached_body = body
+            self._cached_at = now
+        return body
 
+    def start(self):
         try:
-            self._server = ThreadingHTTPServer(("0.0.0.0", self._port), Handler)
+            self._server = ThreadingHTTPServer(("0.0.0.0", self._port), partial(_StatusHandler, self))
         except OSError as e:
             logger.error(f"Failed to start monitor server on port {self._port}: {e}")
             return
@@ -86,22 +129,26 @@ class MonitorServer:
 
     def set_ready(self):
         with self._lock:
+            self._cached_body = None
             if self._state["status"] == "starting":
                 self._state["status"] = "ok"
 
     def set_running(self):
         with self._lock:
+            self._cached_body = None
             self._state["product_sync"]["status"] = "running"
             if self._state["status"] == "starting":
                 self._state["status"] = "ok"
 
     def set_product_waiting(self, next_sync_in):
         with self._lock:
+            self._cached_body = None
             self._state["product_sync"]["status"] = "waiting"
             self._state["product_sync"]["next_sync_in_seconds"] = round(next_sync_in)
 
     def set_order_waiting(self, next_sync_in):
         with self._lock:
+            self._cached_body = None
             if "order_sync" not in self._state:
                 self._state["order_sync"] = {
                     "status": "waiting",
@@ -122,9 +169,10 @@ class MonitorServer:
 
     def update_status(self, sync_results, duration, next_sync_in=None):
         with self._lock:
+            self._cached_body = None
             errors = sync_results.get("errors", 0)
             self._state["product_sync"]["status"] = "error" if errors > 0 else "ok"
-            self._state["product_sync"]["last_sync"] = datetime.now(timezone.utc).isoformat()
+            self._state["product_sync"]["last_sync"] = _iso_utc_now()
             self._state["product_sync"]["last_sync_duration_seconds"] = round(duration, 2)
             self._state["product_sync"]["last_sync_results"] = {
                 "created": sync_results.get("created", 0),
@@ -140,10 +188,11 @@ class MonitorServer:
 
     def update_order_status(self, order_results, duration, next_sync_in=None):
         with self._lock:
+            self._cached_body = None
             errors = order_results.get("errors", 0)
             self._state["order_sync"] = {
                 "status": "error" if errors > 0 else "ok",
-                "last_sync": datetime.now(timezone.utc).isoformat(),
+                "last_sync": _iso_utc_now(),
                 "last_sync_duration_seconds": round(duration, 2),
                 "last_sync_results": {
                     "new_orders": order_results.get("new_orders", 0),
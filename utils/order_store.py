@@ -1,13 +1,118 @@
 import logging
 import os
 import sqlite3
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, Iterable, List, Optional, Set
 
 LOGGER = logging.getLogger('order_store')
 
 DATA_DIR = 'data'
 DB_FILE = os.path.join(DATA_DIR, 'wimood_sync.db')
 
+# Bump when adding a step to OrderStore._upgrade_schema. Recorded per table in
+# schema_version rather than PRAGMA user_version: the database file is shared
+# with ProductMapping and ScrapeCache.
+_SCHEMA_VERSION = 1
+_SCHEMA_NAME = 'orders'
+
+# Schema version 1: Wimood dropship tracking
+_DROPSHIP_COLUMNS = (
+    ('wimood_order_id', 'INTEGER DEFAULT NULL'),
+    ('wimood_status', "TEXT DEFAULT ''"),
+    ('dropship_submitted', 'INTEGER DEFAULT 0'),
+)
+
+_SQL_CREATE_SCHEMA_VERSION = '''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    )
+'''
+_SQL_GET_SCHEMA_VERSION = 'SELECT version FROM schema_version WHERE name = ?'
+_SQL_SET_SCHEMA_VERSION = 'INSERT OR REPLACE INTO schema_version (name, version) VALUES (?, ?)'
+
+_SQL_UPSERT = '''
+    INSERT INTO orders (shopify_order_id, order_number, fulfillment_status, created_at,
+                        tracking_number, tracking_url, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(shopify_order_id) DO UPDATE SET
+        fulfillment_status = CASE
+            WHEN orders.fulfillment_status IN ('delivered', 'cancelled')
+            THEN orders.fulfillment_status
+            ELSE excluded.fulfillment_status
+        END,
+        tracking_number = excluded.tracking_number,
+        tracking_url = excluded.tracking_url,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+
+def _upsert_params(order: Dict) -> tuple:
+    return (
+        order['shopify_order_id'],
+        order['order_number'],
+        order.get('fulfillment_status', 'unfulfilled'),
+        order['created_at'],
+        order.get('tracking_number', ''),
+        order.get('tracking_url', ''),
+    )
+
+
+# Explicit column order for every read, so rows map to dicts with zip()
+# regardless of the physical column order left behind by migrations
+_COLUMNS = (
+    'shopify_order_id', 'order_number', 'fulfillment_status', 'created_at',
+    'tracking_number', 'tracking_url', 'wimood_order_id', 'wimood_status',
+    'dropship_submitted', 'synced_at', 'updated_at',
+)
+_SQL_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM orders"
+
+_SQL_GET_ORDER = f"{_SQL_SELECT} WHERE shopify_order_id = ?"
+_SQL_GET_ORDER_IDS = 'SELECT shopify_order_id FROM orders'
+_SQL_GET_UNFULFILLED = (
+    f"{_SQL_SELECT} WHERE fulfillment_status NOT IN ('fulfilled', 'cancelled') ORDER BY created_at"
+)
+_SQL_GET_UNSUBMITTED = (
+    f"{_SQL_SELECT} WHERE dropship_submitted = 0 "
+    "AND fulfillment_status NOT IN ('fulfilled', 'cancelled') ORDER BY created_at"
+)
+_SQL_GET_SUBMITTED_UNFULFILLED = (
+    f"{_SQL_SELECT} WHERE dropship_submitted = 1 "
+    "AND fulfillment_status NOT IN ('delivered', 'cancelled') ORDER BY created_at"
+)
+_SQL_GET_ACTIVE = (
+    f"{_SQL_SELECT} WHERE fulfillment_status NOT IN ('delivered', 'cancelled') ORDER BY created_at"
+)
+_SQL_GET_ALL = f"{_SQL_SELECT} ORDER BY created_at DESC"
+
+_SQL_MARK_SUBMITTED = '''
+    UPDATE orders SET
+        dropship_submitted = 1,
+        wimood_order_id = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE shopify_order_id = ?
+'''
+_SQL_UPDATE_WIMOOD_STATUS = '''
+    UPDATE orders SET
+        wimood_status = ?,
+        tracking_number = ?,
+        tracking_url = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE shopify_order_id = ?
+'''
+_SQL_UPDATE_FULFILLMENT = '''
+    UPDATE orders SET
+        fulfillment_status = ?,
+        tracking_number = ?,
+        tracking_url = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE shopify_order_id = ?
+'''
+
+
+def _as_dicts(rows) -> List[Dict]:
+    return [dict(zip(_COLUMNS, row)) for row in rows]
+
 
 class OrderStore:
     """
@@ -17,11 +122,27 @@ class OrderStore:
 
     def __init__(self, db_file=DB_FILE):
         self.db_file = db_file
+        os.makedirs(os.path.dirname(self.db_file) or '.', exist_ok=True)
+
+        # One long-lived connection: SQLite's statement cache survives between
+        # calls and writes don't pay for a reconnect. In WAL mode a commit is a
+        # single append + fsync. synchronous stays FULL: a lost mark_submitted
+        # after a power cut would resubmit the order to Wimood.
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=FULL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._lock = threading.Lock()
+
         self._ensure_database()
 
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
     def _ensure_database(self):
-        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
-        with sqlite3.connect(self.db_file) as conn:
+        with self._lock, self._conn as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS orders (
                     shopify_order_id INTEGER PRIMARY KEY,
@@ -38,152 +159,116 @@ class OrderStore:
                 )
             ''')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_fulfillment_status ON orders(fulfillment_status)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_dropship ON orders(dropship_submitted)')
 
-            # Migrate existing databases: add new columns if missing
-            self._migrate(conn)
+            # Bring older databases up to date; skipped once the recorded version is current
+            conn.execute(_SQL_CREATE_SCHEMA_VERSION)
+            row = conn.execute(_SQL_GET_SCHEMA_VERSION, (_SCHEMA_NAME,)).fetchone()
+            version = row[0] if row else 0
+            if version < _SCHEMA_VERSION:
+                self._upgrade_schema(conn, version)
 
-        LOGGER.debug(f"Orders table ready in {self.db_file}")
+            # Serves the submission/polling queues: equality on dropship_submitted,
+            # rows already in created_at order, status filtered from the index.
+            # Created after the upgrade, since old tables may lack dropship_submitted.
+            # Supersedes the old single-column idx_dropship.
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_dropship_created_status '
+                         'ON orders(dropship_submitted, created_at, fulfillment_status)')
+            conn.execute('DROP INDEX IF EXISTS idx_dropship')
 
-    def _migrate(self, conn):
-        """Add columns that may be missing from older schema versions."""
-        cursor = conn.execute("PRAGMA table_info(orders)")
-        existing_columns = {row[1] for row in cursor.fetchall()}
+        LOGGER.debug("Orders table ready in %s", self.db_file)
 
-        migrations = [
-            ('wimood_order_id', 'INTEGER DEFAULT NULL'),
-            ('wimood_status', "TEXT DEFAULT ''"),
-            ('dropship_submitted', 'INTEGER DEFAULT 0'),
-        ]
+    def _upgrade_schema(self, conn, version: int):
+        """Apply the schema changes between ``version`` and _SCHEMA_VERSION, then record it."""
+        if version < 1:
+            # Databases from before the version was tracked are all at 0, whether or
+            # not they already have the dropship columns, so check them this once
+            existing_columns = {row[1] for row in conn.execute('PRAGMA table_info(orders)')}
+            for col_name, col_def in _DROPSHIP_COLUMNS:
+                if col_name not in existing_columns:
+                    conn.execute(f'ALTER TABLE orders ADD COLUMN {col_name} {col_def}')
+                    LOGGER.info(f"Migrated: added column '{col_name}' to orders table")
 
-        for col_name, col_def in migrations:
-            if col_name not in existing_columns:
-                conn.execute(f'ALTER TABLE orders ADD COLUMN {col_name} {col_def}')
-                LOGGER.info(f"Migrated: added column '{col_name}' to orders table")
+        conn.execute(_SQL_SET_SCHEMA_VERSION, (_SCHEMA_NAME, _SCHEMA_VERSION))
+        LOGGER.debug("Orders schema upgraded from version %s to %s", version, _SCHEMA_VERSION)
 
     def upsert_order(self, order: Dict):
         """Insert or update an order. Preserves terminal states (delivered/cancelled)."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute('''
-                INSERT INTO orders (shopify_order_id, order_number, fulfillment_status, created_at,
-                                    tracking_number, tracking_url, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(shopify_order_id) DO UPDATE SET
-                    fulfillment_status = CASE
-                        WHEN orders.fulfillment_status IN ('delivered', 'cancelled')
-                        THEN orders.fulfillment_status
-                        ELSE excluded.fulfillment_status
-                    END,
-                    tracking_number = excluded.tracking_number,
-                    tracking_url = excluded.tracking_url,
-                    updated_at = CURRENT_TIMESTAMP
-            ''', (
-                order['shopify_order_id'],
-                order['order_number'],
-                order.get('fulfillment_status', 'unfulfilled'),
-                order['created_at'],
-                order.get('tracking_number', ''),
-                order.get('tracking_url', ''),
-            ))
-        LOGGER.debug(f"Upserted order {order['shopify_order_id']} (#{order['order_number']})")
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPSERT, _upsert_params(order))
+        LOGGER.debug("Upserted order %s (#%s)", order['shopify_order_id'], order['order_number'])
+
+    def upsert_orders_bulk(self, orders: Iterable[Dict]):
+        """Insert or update many orders in a single transaction (see upsert_order)."""
+        params = [_upsert_params(order) for order in orders]
+        if not params:
+            return
+        with self._lock, self._conn as conn:
+            conn.executemany(_SQL_UPSERT, params)
+        LOGGER.debug("Upserted %s orders", len(params))
 
     def get_order(self, shopify_order_id: int) -> Optional[Dict]:
         """Get a single order by Shopify order ID."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
-                'SELECT * FROM orders WHERE shopify_order_id = ?',
-                (shopify_order_id,)
-            ).fetchone()
-        return dict(row) if row else None
+        with self._lock:
+            row = self._conn.execute(_SQL_GET_ORDER, (shopify_order_id,)).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def get_order_ids(self) -> Set[int]:
+        """Get the Shopify order IDs of all stored orders."""
+        with self._lock:
+            rows = self._conn.execute(_SQL_GET_ORDER_IDS).fetchall()
+        return {row[0] for row in rows}
 
     def get_unfulfilled_orders(self) -> List[Dict]:
         """Get all orders that are not yet fulfilled."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                "SELECT * FROM orders WHERE fulfillment_status NOT IN ('fulfilled', 'cancelled') ORDER BY created_at"
-            ).fetchall()
-        return [dict(row) for row in rows]
+        with self._lock:
+            rows = self._conn.execute(_SQL_GET_UNFULFILLED).fetchall()
+        return _as_dicts(rows)
 
     def get_unsubmitted_orders(self) -> List[Dict]:
         """Get orders not yet submitted to Wimood for dropshipping."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                "SELECT * FROM orders WHERE dropship_submitted = 0 "
-                "AND fulfillment_status NOT IN ('fulfilled', 'cancelled') ORDER BY created_at"
-            ).fetchall()
-        return [dict(row) for row in rows]
+        with self._lock:
+            rows = self._conn.execute(_SQL_GET_UNSUBMITTED).fetchall()
+        return _as_dicts(rows)
 
     def get_submitted_unfulfilled(self) -> List[Dict]:
         """Get orders submitted to Wimood that still need polling (not yet delivered or cancelled)."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                "SELECT * FROM orders WHERE dropship_submitted = 1 "
-                "AND fulfillment_status NOT IN ('delivered', 'cancelled') ORDER BY created_at"
-            ).fetchall()
-        return [dict(row) for row in rows]
+        with self._lock:
+            rows = self._conn.execute(_SQL_GET_SUBMITTED_UNFULFILLED).fetchall()
+        return _as_dicts(rows)
 
     def mark_submitted(self, shopify_order_id: int, wimood_order_id: int):
         """Mark an order as submitted to Wimood."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute('''
-                UPDATE orders SET
-                    dropship_submitted = 1,
-                    wimood_order_id = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE shopify_order_id = ?
-            ''', (wimood_order_id, shopify_order_id))
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_MARK_SUBMITTED, (wimood_order_id, shopify_order_id))
         LOGGER.info(f"Order {shopify_order_id} marked as submitted (Wimood ID: {wimood_order_id})")
 
     def update_wimood_status(self, shopify_order_id: int, wimood_status: str,
                              tracking_number: str = '', tracking_url: str = ''):
         """Update Wimood order status and tracking info."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute('''
-                UPDATE orders SET
-                    wimood_status = ?,
-                    tracking_number = ?,
-                    tracking_url = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE shopify_order_id = ?
-            ''', (wimood_status, tracking_number, tracking_url, shopify_order_id))
-        LOGGER.debug(f"Updated Wimood status for order {shopify_order_id}: {wimood_status}")
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPDATE_WIMOOD_STATUS, (wimood_status, tracking_number, tracking_url, shopify_order_id))
+        LOGGER.debug("Updated Wimood status for order %s: %s", shopify_order_id, wimood_status)
 
     def update_fulfillment(self, shopify_order_id: int, fulfillment_status: str,
                            tracking_number: str = '', tracking_url: str = ''):
         """Update fulfillment status and tracking info for an order."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute('''
-                UPDATE orders SET
-                    fulfillment_status = ?,
-                    tracking_number = ?,
-                    tracking_url = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE shopify_order_id = ?
-            ''', (fulfillment_status, tracking_number, tracking_url, shopify_order_id))
-        LOGGER.debug(f"Updated order {shopify_order_id} fulfillment: {fulfillment_status}")
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPDATE_FULFILLMENT, (fulfillment_status, tracking_number, tracking_url, shopify_order_id))
+        LOGGER.debug("Updated order %s fulfillment: %s", shopify_order_id, fulfillment_status)
 
     def get_active_orders(self) -> List[Dict]:
         """Get all orders that still need processing (not delivered or cancelled)."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                "SELECT * FROM orders WHERE fulfillment_status NOT IN ('delivered', 'cancelled') "
-                "ORDER BY created_at"
-            ).fetchall()
-        return [dict(row) for row in rows]
+        with self._lock:
+            rows = self._conn.execute(_SQL_GET_ACTIVE).fetchall()
+        return _as_dicts(rows)
 
     def get_all_orders(self) -> List[Dict]:
         """Get all orders."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute('SELECT * FROM orders ORDER BY created_at DESC').fetchall()
-        return [dict(row) for row in rows]
+        with self._lock:
+            rows = self._conn.execute(_SQL_GET_ALL).fetchall()
+        return _as_dicts(rows)
 
     def __len__(self):
-        with sqlite3.connect(self.db_file) as conn:
-            row = conn.execute('SELECT COUNT(*) FROM orders').fetchone()
+        with self._lock:
+            row = self._conn.execute('SELECT COUNT(*) FROM orders').fetchone()
         return row[0]
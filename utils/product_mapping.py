@@ -1,13 +1,32 @@
 import logging
 import os
+import pathlib
+import queue
 import sqlite3
-from typing import Dict, List, Optional
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
 
 LOGGER = logging.getLogger('product_mapping')
 
 DATA_DIR = 'data'
 DB_FILE = os.path.join(DATA_DIR, 'wimood_sync.db')
 
+# Read-only connections kept open for lookups
+READ_POOL_SIZE = 4
+
+# Per-lookup cache size; a full cache is emptied and starts over
+CACHE_MAX_ENTRIES = 10000
+
+_SQL_UPSERT = '''
+    INSERT INTO product_mapping (wimood_product_id, shopify_product_id, sku, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(wimood_product_id) DO UPDATE SET
+        shopify_product_id = excluded.shopify_product_id,
+        sku = excluded.sku,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
 
 class ProductMapping:
     """
@@ -17,11 +36,85 @@ class ProductMapping:
 
     def __init__(self, db_file=DB_FILE):
         self.db_file = db_file
+        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+
+        # One long-lived writer connection (see OrderStore); the lock serializes
+        # writes between the sync loop and any worker threads.
+        self._conn = self._connect(self.db_file)
+        self._lock = threading.Lock()
+
+        # Lookup results (misses included) until the next write. A lookup that
+        # raced a write stores nothing: the write bumps the generation first.
+        # After preload() the caches mirror the whole table and writes update
+        # them in place instead.
+        self._shopify_id_cache: Dict[str, Optional[int]] = {}
+        self._sku_cache: Dict[str, Optional[Tuple[str, int]]] = {}
+        # Preloaded only: each product's SKU and each SKU's products, so a write
+        # can fix up the SKU entries it touches without rescanning the cache
+        self._sku_by_wimood_id: Dict[str, str] = {}
+        self._ids_by_sku: Dict[str, Dict[str, int]] = {}
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+        self._preloaded = False
+
         self._ensure_database()
 
+        # Lookups check out one of a few read-only connections, so under WAL they
+        # run alongside each other and alongside writes instead of queueing on
+        # the writer lock. Opened after _ensure_database: mode=ro needs the file.
+        self._readers = queue.SimpleQueue()
+        reader_uri = f"{pathlib.Path(self.db_file).absolute().as_uri()}?mode=ro"
+        for _ in range(READ_POOL_SIZE):
+            self._readers.put(self._connect(reader_uri, uri=True))
+
+    @staticmethod
+    def _connect(database, **kwargs) -> sqlite3.Connection:
+        conn = sqlite3.connect(database, check_same_thread=False, **kwargs)
+        # Mappings can be rebuilt from Shopify, so NORMAL (fsync at checkpoints
+        # only) is durable enough; wait for the order store's writes instead of
+        # failing with "database is locked".
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-20000')
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+
+    @contextmanager
+    def _reader(self):
+        """Check out a read-only connection for the duration of the block."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def optimize(self):
+        """
+        Refresh the query planner's statistics so lookups keep using the right index.
+
+        The first call on a database without statistics runs a full ANALYZE;
+        later calls use PRAGMA optimize, which only re-analyzes what changed.
+        """
+        with self._lock:
+            analyzed = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            ).fetchone()
+            self._conn.execute('PRAGMA optimize' if analyzed else 'ANALYZE')
+        LOGGER.debug("Optimized %s (%s)", self.db_file, 'PRAGMA optimize' if analyzed else 'ANALYZE')
+
+    def close(self):
+        """Optimize, then close the writer and all pooled reader connections."""
+        self.optimize()
+        with self._lock:
+            self._conn.close()
+        for _ in range(READ_POOL_SIZE):
+            with self._reader() as conn:
+                conn.close()
+
     def _ensure_database(self):
-        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
-        with sqlite3.connect(self.db_file) as conn:
+        with self._lock, self._conn as conn:
+            # Persisted in the database file: readers no longer block on writers
+            conn.execute('PRAGMA journal_mode=WAL')
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS product_mapping (
                     wimood_product_id TEXT PRIMARY KEY,
@@ -31,68 +124,177 @@ class ProductMapping:
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_sku ON product_mapping(sku)')
+            # Covers get_by_sku, so it never has to visit the table rows;
+            # supersedes the old single-column idx_sku
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_sku_cover '
+                         'ON product_mapping(sku, wimood_product_id, shopify_product_id)')
+            conn.execute('DROP INDEX IF EXISTS idx_sku')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_shopify_id ON product_mapping(shopify_product_id)')
-        LOGGER.debug(f"Product mapping table ready in {self.db_file}")
+        LOGGER.debug("Product mapping table ready in %s", self.db_file)
+
+    def _cache_put(self, cache: Dict, key, value, generation: int):
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            if len(cache) >= CACHE_MAX_ENTRIES:
+                cache.clear()
+            cache[key] = value
+
+    def _update_caches(self, rows: Iterable[Tuple[str, int, str]] = (), removed: Iterable[str] = ()):
+        """Apply written/removed mappings to a preloaded cache, or drop the per-key cache."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            if not self._preloaded:
+                self._shopify_id_cache.clear()
+                self._sku_cache.clear()
+                return
+
+            for wimood_id in removed:
+                self._shopify_id_cache.pop(wimood_id, None)
+                self._move_sku(wimood_id)
+            # One row at a time: a product may appear twice with different SKUs
+            for wimood_id, shopify_id, sku in rows:
+                self._shopify_id_cache[wimood_id] = shopify_id
+                self._move_sku(wimood_id, sku, shopify_id)
+
+    def _move_sku(self, wimood_id: str, sku: Optional[str] = None, shopify_id: Optional[int] = None):
+        """Detach a product from its preloaded SKU entry and, if given, attach it to `sku`."""
+        old_sku = self._sku_by_wimood_id.pop(wimood_id, None)
+        if old_sku is not None:
+            del self._ids_by_sku[old_sku][wimood_id]
+            self._refresh_sku(old_sku)
+        if sku is not None:
+            self._sku_by_wimood_id[wimood_id] = sku
+            self._ids_by_sku.setdefault(sku, {})[wimood_id] = shopify_id
+            self._refresh_sku(sku)
+
+    def _refresh_sku(self, sku: str):
+        # Several products may share a SKU; like the SQL lookup (which reads the
+        # (sku, wimood_product_id) index), the lowest product ID wins
+        owners = self._ids_by_sku.get(sku)
+        if owners:
+            wimood_id = min(owners)
+            self._sku_cache[sku] = (wimood_id, owners[wimood_id])
+        else:
+            self._ids_by_sku.pop(sku, None)
+            self._sku_cache.pop(sku, None)
+
+    def preload(self):
+        """Load every mapping into memory; lookups are then served without querying SQLite."""
+        generation = self._cache_generation
+        with self._reader() as conn:
+            rows = conn.execute(
+                'SELECT wimood_product_id, shopify_product_id, sku FROM product_mapping'
+            ).fetchall()
+
+        shopify_ids = {}
+        sku_by_wimood_id = {}
+        ids_by_sku = {}
+        for wimood_id, shopify_id, sku in rows:
+            shopify_ids[wimood_id] = shopify_id
+            sku_by_wimood_id[wimood_id] = sku
+            ids_by_sku.setdefault(sku, {})[wimood_id] = shopify_id
+        skus = {}
+        for sku, owners in ids_by_sku.items():
+            wimood_id = min(owners)
+            skus[sku] = (wimood_id, owners[wimood_id])
+
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                # Raced a write; keep the per-key cache rather than a stale mirror
+                return
+            self._shopify_id_cache = shopify_ids
+            self._sku_cache = skus
+            self._sku_by_wimood_id = sku_by_wimood_id
+            self._ids_by_sku = ids_by_sku
+            self._preloaded = True
+        LOGGER.debug("Preloaded %s product mappings", len(rows))
 
     def get_shopify_id(self, wimood_product_id: str) -> Optional[int]:
         """Get Shopify product ID for a given Wimood product_id."""
-        with sqlite3.connect(self.db_file) as conn:
+        try:
+            return self._shopify_id_cache[wimood_product_id]
+        except KeyError:
+            if self._preloaded:
+                return None
+        generation = self._cache_generation
+        with self._reader() as conn:
             row = conn.execute(
                 'SELECT shopify_product_id FROM product_mapping WHERE wimood_product_id = ?',
                 (wimood_product_id,)
             ).fetchone()
-        return row[0] if row else None
+        shopify_id = row[0] if row else None
+        self._cache_put(self._shopify_id_cache, wimood_product_id, shopify_id, generation)
+        return shopify_id
 
     def set_mapping(self, wimood_product_id: str, shopify_product_id: int, sku: str):
         """Store or update a product mapping."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute('''
-                INSERT INTO product_mapping (wimood_product_id, shopify_product_id, sku, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(wimood_product_id) DO UPDATE SET
-                    shopify_product_id = excluded.shopify_product_id,
-                    sku = excluded.sku,
-                    updated_at = CURRENT_TIMESTAMP
-            ''', (wimood_product_id, shopify_product_id, sku))
-        LOGGER.debug(f"Mapped Wimood product {wimood_product_id} -> Shopify {shopify_product_id} (SKU={sku})")
+        with self._lock, self._conn as conn:
+            conn.execute(_SQL_UPSERT, (wimood_product_id, shopify_product_id, sku))
+        self._update_caches(rows=[(wimood_product_id, shopify_product_id, sku)])
+        LOGGER.debug("Mapped Wimood product %s -> Shopify %s (SKU=%s)", wimood_product_id, shopify_product_id, sku)
+
+    def set_mappings_bulk(self, rows: Iterable[Tuple[str, int, str]]):
+        """
+        Store or update many product mappings in a single transaction.
+
+        Args:
+            rows: Iterable of (wimood_product_id, shopify_product_id, sku) tuples.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock, self._conn as conn:
+            conn.executemany(_SQL_UPSERT, rows)
+        self._update_caches(rows=rows)
+        LOGGER.debug("Stored %s product mappings", len(rows))
 
     def get_by_sku(self, sku: str) -> Optional[Dict]:
         """Find mapping by SKU."""
-        with sqlite3.connect(self.db_file) as conn:
-            row = conn.execute(
-                'SELECT wimood_product_id, shopify_product_id FROM product_mapping WHERE sku = ?',
-                (sku,)
-            ).fetchone()
+        try:
+            row = self._sku_cache[sku]
+        except KeyError:
+            if self._preloaded:
+                return None
+            generation = self._cache_generation
+            with self._reader() as conn:
+                row = conn.execute(
+                    'SELECT wimood_product_id, shopify_product_id FROM product_mapping WHERE sku = ?',
+                    (sku,)
+                ).fetchone()
+            self._cache_put(self._sku_cache, sku, row, generation)
         if row:
             return {'wimood_product_id': row[0], 'shopify_product_id': row[1]}
         return None
 
     def get_all_shopify_ids(self) -> List[int]:
         """Get all Shopify product IDs managed by this sync."""
-        with sqlite3.connect(self.db_file) as conn:
+        with self._reader() as conn:
             rows = conn.execute('SELECT shopify_product_id FROM product_mapping').fetchall()
         return [row[0] for row in rows]
 
     def get_all_mappings(self) -> List[Dict]:
         """Get all mappings as a list of dicts."""
-        with sqlite3.connect(self.db_file) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._reader() as conn:
             rows = conn.execute(
                 'SELECT wimood_product_id, shopify_product_id, sku FROM product_mapping'
             ).fetchall()
-        return [dict(row) for row in rows]
+        return [
+            {'wimood_product_id': wimood_id, 'shopify_product_id': shopify_id, 'sku': sku}
+            for wimood_id, shopify_id, sku in rows
+        ]
 
     def remove(self, wimood_product_id: str) -> bool:
         """Remove a product mapping. Returns True if a row was deleted."""
-        with sqlite3.connect(self.db_file) as conn:
+        with self._lock, self._conn as conn:
             cursor = conn.execute(
                 'DELETE FROM product_mapping WHERE wimood_product_id = ?',
                 (wimood_product_id,)
             )
+        self._update_caches(removed=[wimood_product_id])
         deleted = cursor.rowcount > 0
         if deleted:
-            LOGGER.debug(f"Removed mapping for Wimood product {wimood_product_id}")
+            LOGGER.debug("Removed mapping for Wimood product %s", wimood_product_id)
         return deleted
 
     def __bool__(self):
@@ -100,6 +302,6 @@ class ProductMapping:
         return True
 
     def __len__(self):
-        with sqlite3.connect(self.db_file) as conn:
+        with self._reader() as conn:
             row = conn.execute('SELECT COUNT(*) FROM product_mapping').fetchone()
         return row[0]
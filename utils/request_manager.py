@@ -1,22 +1,31 @@
+import itertools
 import logging
 import random
+import socket
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
+from urllib.parse import urlparse
 
 import requests
 import yaml
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 from urllib3.util.retry import Retry
 
 LOGGER = logging.getLogger('request_manager')
 
+# libyaml's C loader parses several times faster; fall back to the pure-Python
+# one when PyYAML was built without it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def load_user_agents(path: str = "config/user_agents.yaml") -> List[str]:
     """Loads a list of user agents from a YAML file."""
     try:
         # Assuming the config directory is relative to the project root
         with open(Path(path), "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YAML_LOADER)
         return data.get("user_agents", [])
     except Exception:
         # Return a safe default on failure
@@ -24,25 +33,62 @@ def load_user_agents(path: str = "config/user_agents.yaml") -> List[str]:
 
 USER_AGENTS = load_user_agents()
 
+# Rotate through the user agents in an order shuffled once per process
+_UA_CYCLE = itertools.cycle(random.sample(USER_AGENTS, len(USER_AGENTS)) or ["Mozilla/5.0"])
+
+# Copied per request; only the User-Agent changes
+_HEADER_TEMPLATE = {"User-Agent": "", "Connection": "keep-alive"}
+
+
+# Chunk size used when reading a body under a max_bytes cap
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets use TCP keepalive, so idle pooled connections dropped by a peer are detected."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ])
+        super().init_poolmanager(*args, **kwargs)
+
 
 class RequestManager:
     """
     Manages HTTP requests with retries, backoff, and user-agent rotation.
     Proxies/Sockets have been removed per project requirement.
+
+    Each host gets its own lazily created Session, so the Shopify, Wimood API
+    and Wimood shop connection pools never evict each other's idle connections.
     """
 
-    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5):
+    def __init__(
+            self,
+            max_retries: int = 3,
+            backoff_factor: float = 0.5,
+            pool_maxsize: int = 16,
+            host_pool_sizes: Optional[Dict[str, int]] = None
+    ):
         """
-        Initializes the RequestManager with a requests.Session.
+        Initializes the RequestManager. Sessions are created per host on first use.
+
+        Args:
+            max_retries: Total retries per request for retryable status codes.
+            backoff_factor: Exponential backoff factor between retries.
+            pool_maxsize: Keep-alive connections kept for hosts without an override.
+            host_pool_sizes: Per-host pool size overrides, keyed on netloc.
         """
-        self.session = requests.Session()
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(host_pool_sizes or {})
 
-        self._configure_retries()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
 
-    def _configure_retries(self):
-        """Sets up the HTTPAdapter with retry logic for the session."""
+    def _build_session(self, pool_maxsize: int) -> requests.Session:
+        """Creates a Session with a pooled HTTPAdapter carrying the retry logic."""
 
         # Configure the Retry object
         # status_forcelist: Which HTTP status codes to retry on (e.g., server errors)
@@ -54,23 +100,47 @@ class RequestManager:
             allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"]
         )
 
-        # Attach the retry strategy to the Session via an adapter
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # A session only ever talks to one host, so a single pool is enough;
+        # pool_maxsize bounds how many keep-alive connections it holds
+        # pool_block=False: a burst beyond pool_maxsize opens extra connections
+        # rather than stalling; only pool_maxsize of them are kept alive
+        adapter = _KeepAliveAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
+            max_retries=retry_strategy
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get_session(self, url: str) -> requests.Session:
+        """Returns the Session for the URL's host, creating it on first use."""
+        host = urlparse(url).netloc
+        session = self._sessions.get(host)
+        if session is None:
+            with self._sessions_lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    pool_maxsize = self.host_pool_sizes.get(host, self.pool_maxsize)
+                    session = self._build_session(pool_maxsize)
+                    self._sessions[host] = session
+                    LOGGER.debug("Created session for %s (pool_maxsize=%s)", host, pool_maxsize)
+        return session
 
     def _get_random_headers(self) -> Dict[str, str]:
-        """Generates random headers with a rotated User-Agent."""
-        return {
-            "User-Agent": random.choice(USER_AGENTS) if USER_AGENTS else "Mozilla/5.0",
-            "Connection": "keep-alive",
-        }
+        """Generates headers with the next User-Agent in the rotation."""
+        headers = _HEADER_TEMPLATE.copy()
+        headers["User-Agent"] = next(_UA_CYCLE)
+        return headers
 
     def request(
             self,
             method: str,
             url: str,
             timeout: int = 30,  # Increased timeout for robustness
+            max_bytes: Optional[int] = None,
             **kwargs
     ) -> Optional[requests.Response]:
         """
@@ -80,6 +150,8 @@ class RequestManager:
             method: The HTTP method (e.g., 'GET', 'POST').
             url: The URL to request.
             timeout: Request timeout in seconds.
+            max_bytes: If set, the body is streamed and the request fails once it
+                exceeds this many bytes, instead of buffering it whole.
             **kwargs: Additional arguments for requests.request.
 
         Returns:
@@ -95,8 +167,11 @@ class RequestManager:
         else:
             headers = default_headers
 
+        if max_bytes is not None:
+            kwargs['stream'] = True
+
         try:
-            response = self.session.request(
+            response = self._get_session(url).request(
                 method=method,
                 url=url,
                 headers=headers,
@@ -108,6 +183,10 @@ class RequestManager:
             # We explicitly check for other permanent failure codes here.
             response.raise_for_status()
 
+            if max_bytes is not None and not self._read_capped(response, max_bytes):
+                LOGGER.error(f"Response for {method} {url} exceeds {max_bytes} bytes, aborted")
+                return None
+
             return response
 
         except requests.exceptions.HTTPError as e:
@@ -127,6 +206,38 @@ class RequestManager:
             return None
 
 
+    @staticmethod
+    def _read_capped(response: requests.Response, max_bytes: int) -> bool:
+        """
+        Reads a streamed body into response.content, up to max_bytes.
+
+        Returns:
+            True if the whole body fit, False if it was too large (the connection is closed).
+        """
+        try:
+            # A missing or malformed Content-Length (e.g. merged '10, 10') just
+            # means the size is unknown; the byte count below still enforces the cap
+            try:
+                declared = int(response.headers.get('Content-Length', 0))
+            except ValueError:
+                declared = 0
+            if declared > max_bytes:
+                return False
+
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=_READ_CHUNK_SIZE):
+                body += chunk
+                if len(body) > max_bytes:
+                    return False
+
+            # Hand the body over as if requests had read it itself
+            response._content = bytes(body)
+            response._content_consumed = True
+            return True
+        finally:
+            response.close()
+
+
 def init_request_manager(env_config: dict) -> RequestManager:
     """Creates a RequestManager instance based on the loaded ENV configuration."""
 
@@ -136,7 +247,19 @@ def init_request_manager(env_config: dict) -> RequestManager:
     # You might want a separate BACKOFF_FACTOR in ENV, or use a sensible default
     backoff_factor = 0.5
 
+    # The shop front-end serves the threaded scraper and gets the largest pool;
+    # the XML API is fetched once per cycle and needs only a few connections
+    host_pool_sizes = {}
+    api_host = urlparse(env_config.get('WIMOOD_API_URL') or '').netloc
+    if api_host:
+        host_pool_sizes[api_host] = 8
+    scrape_host = urlparse(env_config.get('WIMOOD_BASE_URL') or '').netloc
+    if scrape_host:
+        host_pool_sizes[scrape_host] = env_config.get('SCRAPE_POOL_MAXSIZE', 32)
+
     return RequestManager(
         max_retries=max_retries,
-        backoff_factor=backoff_factor
+        backoff_factor=backoff_factor,
+        pool_maxsize=env_config.get('HTTP_POOL_MAXSIZE', 16),
+        host_pool_sizes=host_pool_sizes
     )
@@ -1,74 +1,139 @@
 import json
 import logging
 import os
-import tempfile
+import sqlite3
+import threading
 import time
 
 LOGGER = logging.getLogger('scrape_cache')
 
 CACHE_DIR = 'data'
-CACHE_FILE = os.path.join(CACHE_DIR, 'scrape_cache.json')
+DB_FILE = os.path.join(CACHE_DIR, 'wimood_sync.db')
+# Pre-SQLite cache file, imported once into the table and then renamed
+LEGACY_CACHE_FILE = os.path.join(CACHE_DIR, 'scrape_cache.json')
+
+# Entries set within this window are written together in one transaction
+FLUSH_INTERVAL_SECONDS = 5.0
+
+SECONDS_PER_DAY = 86400
+
+# Compact, non-ASCII-escaping JSON for the data column; the encoder/decoder
+# are built once rather than on every call
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+_decode = json.JSONDecoder().decode
+
+_SQL_GET = 'SELECT data FROM scrape_cache WHERE sku = ?'
+_SQL_GET_TIMESTAMP = 'SELECT ts FROM scrape_cache WHERE sku = ?'
+_SQL_SET = 'INSERT OR REPLACE INTO scrape_cache (sku, data, ts) VALUES (?, ?, ?)'
+_SQL_FRESH_SKUS = 'SELECT sku FROM scrape_cache WHERE ts >= ?'
 
 
 class ScrapeCache:
     """
-    JSON-file-based cache for scraped product data.
+    SQLite-based cache for scraped product data.
     Avoids re-scraping unchanged products every sync cycle.
     """
 
-    def __init__(self, cache_file=CACHE_FILE):
-        self.cache_file = cache_file
-        self._cache = {}
-        self.load()
+    def __init__(self, db_file=DB_FILE, legacy_cache_file=LEGACY_CACHE_FILE):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(self.db_file) or '.', exist_ok=True)
 
-    def load(self):
-        """Load cache from disk."""
-        if not os.path.exists(self.cache_file):
-            self._cache = {}
-            return
+        # One long-lived connection (see OrderStore). Entries can always be
+        # scraped again, so NORMAL durability is enough.
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._lock = threading.Lock()
 
-        try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                self._cache = json.load(f)
-            LOGGER.info(f"Loaded scrape cache with {len(self._cache)} entries.")
-        except (json.JSONDecodeError, IOError) as e:
-            LOGGER.warning(f"Failed to load scrape cache, starting fresh: {e}")
-            self._cache = {}
+        # Entries set since the last flush: sku -> (encoded data, timestamp)
+        self._pending = {}
+        self._last_flush = time.monotonic()
+
+        self._ensure_database()
+        self._import_legacy_file(legacy_cache_file)
 
-    def save(self):
-        """Save cache to disk using atomic write (temp file + rename)."""
-        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+    def close(self):
+        """Write any pending entries and close the underlying database connection."""
+        with self._lock:
+            self._flush_locked(force=True)
+            self._conn.close()
+
+    def flush(self, force=False):
+        """
+        Write pending entries in a single transaction.
+
+        Args:
+            force: Write even if the last flush was less than FLUSH_INTERVAL_SECONDS ago.
+        """
+        with self._lock:
+            self._flush_locked(force)
+
+    def _flush_locked(self, force):
+        if not self._pending:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < FLUSH_INTERVAL_SECONDS:
+            return
+        with self._conn as conn:
+            conn.executemany(_SQL_SET, [(sku, data, ts) for sku, (data, ts) in self._pending.items()])
+        LOGGER.debug("Flushed %s scrape cache entries.", len(self._pending))
+        self._pending.clear()
+        self._last_flush = now
+
+    def _ensure_database(self):
+        with self._lock, self._conn as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_cache (
+                    sku TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    ts REAL NOT NULL
+                )
+            ''')
+        LOGGER.debug("Scrape cache table ready in %s", self.db_file)
+
+    def _import_legacy_file(self, legacy_cache_file):
+        """Move entries from the old JSON cache file into the table, once."""
+        if not legacy_cache_file or not os.path.exists(legacy_cache_file):
+            return
 
         try:
-            fd, tmp_path = tempfile.mkstemp(
-                dir=os.path.dirname(self.cache_file),
-                suffix='.tmp'
+            with open(legacy_cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            rows = [
+                (sku, _encode(entry.get('data')), entry.get('timestamp', 0))
+                for sku, entry in entries.items()
+            ]
+        except (json.JSONDecodeError, IOError, AttributeError) as e:
+            LOGGER.warning(f"Failed to import legacy scrape cache, starting fresh: {e}")
+            rows = []
+
+        # Entries already in the table are newer than the legacy file's
+        with self._lock, self._conn as conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO scrape_cache (sku, data, ts) VALUES (?, ?, ?)', rows
             )
-            with os.fdopen(fd, 'w', encoding='utf-8') as f:
-                json.dump(self._cache, f, indent=2, ensure_ascii=False)
-            os.replace(tmp_path, self.cache_file)
-            LOGGER.debug(f"Saved scrape cache with {len(self._cache)} entries.")
-        except IOError as e:
-            LOGGER.error(f"Failed to save scrape cache: {e}")
+        os.replace(legacy_cache_file, f"{legacy_cache_file}.imported")
+        LOGGER.info(f"Imported {len(rows)} entries from legacy scrape cache {legacy_cache_file}.")
 
     def get(self, sku):
         """
         Get cached scrape data for a SKU.
 
         Returns:
-            dict with 'data' and 'timestamp', or None if not cached.
+            The cached data dict, or None if not cached.
         """
-        entry = self._cache.get(sku)
-        if entry is None:
-            return None
-        return entry.get('data')
+        with self._lock:
+            pending = self._pending.get(sku)
+            row = pending or self._conn.execute(_SQL_GET, (sku,)).fetchone()
+        return _decode(row[0]) if row else None
 
     def set(self, sku, data):
-        """Store scrape data for a SKU with current timestamp."""
-        self._cache[sku] = {
-            'data': data,
-            'timestamp': time.time(),
-        }
+        """Store scrape data for a SKU with current timestamp; written on the next due flush."""
+        entry = (_encode(data), time.time())
+        with self._lock:
+            self._pending[sku] = entry
+            self._flush_locked(force=False)
 
     def is_stale(self, sku, max_age_days=7):
         """
@@ -77,15 +142,39 @@ class ScrapeCache:
         Returns:
             True if entry is missing or older than max_age_days.
         """
-        entry = self._cache.get(sku)
-        if entry is None:
+        with self._lock:
+            pending = self._pending.get(sku)
+            if pending is not None:
+                timestamp = pending[1]
+            else:
+                row = self._conn.execute(_SQL_GET_TIMESTAMP, (sku,)).fetchone()
+                timestamp = row[0] if row else None
+        if timestamp is None:
             return True
+        return timestamp < time.time() - max_age_days * SECONDS_PER_DAY
 
-        timestamp = entry.get('timestamp', 0)
-        age_seconds = time.time() - timestamp
-        max_age_seconds = max_age_days * 86400
+    def fresh_skus(self, max_age_days=7):
+        """
+        Get every SKU whose entry is no older than max_age_days, in one query.
+
+        Use this instead of calling is_stale per SKU when checking a whole catalog;
+        a SKU missing from the result is stale or not cached.
 
-        return age_seconds > max_age_seconds
+        Returns:
+            Set of SKUs with a fresh entry, including pending ones.
+        """
+        cutoff = time.time() - max_age_days * SECONDS_PER_DAY
+        with self._lock:
+            fresh = {sku for (sku,) in self._conn.execute(_SQL_FRESH_SKUS, (cutoff,))}
+            for sku, (_, ts) in self._pending.items():
+                if ts >= cutoff:
+                    fresh.add(sku)
+                else:
+                    fresh.discard(sku)
+        return fresh
 
     def __len__(self):
-        return len(self._cache)
+        with self._lock:
+            self._flush_locked(force=True)
+            row = self._conn.execute('SELECT COUNT(*) FROM scrape_cache').fetchone()
+        return row[0]